@@ -0,0 +1,37 @@
+"""Create sync_state table
+
+Revision ID: 3c5f1a9e2b7d
+Revises: 77e4d0a13aa8
+Create Date: 2026-10-18 09:12:31.402118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c5f1a9e2b7d"
+down_revision: str | Sequence[str] | None = "77e4d0a13aa8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sync_state",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("owner", sa.String(length=100), nullable=False),
+        sa.Column("repo", sa.String(length=100), nullable=False),
+        sa.Column("last_updated_at", sa.DateTime(), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("owner", "repo", name="uq_sync_state_owner_repo"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("sync_state")
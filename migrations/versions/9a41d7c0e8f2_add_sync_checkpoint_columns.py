@@ -0,0 +1,34 @@
+"""Add sync checkpoint columns
+
+Revision ID: 9a41d7c0e8f2
+Revises: 3c5f1a9e2b7d
+Create Date: 2026-10-18 11:40:05.118903
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a41d7c0e8f2"
+down_revision: str | Sequence[str] | None = "3c5f1a9e2b7d"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("sync_state", sa.Column("checkpoint_page", sa.Integer(), nullable=True))
+    op.add_column("sync_state", sa.Column("checkpoint_cursor", sa.String(length=200), nullable=True))
+    op.add_column("sync_state", sa.Column("checkpoint_since", sa.DateTime(), nullable=True))
+    op.add_column("sync_state", sa.Column("checkpoint_started_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("sync_state", "checkpoint_started_at")
+    op.drop_column("sync_state", "checkpoint_since")
+    op.drop_column("sync_state", "checkpoint_cursor")
+    op.drop_column("sync_state", "checkpoint_page")
@@ -0,0 +1,28 @@
+"""Add used to github_rate_limits
+
+Revision ID: a83d5e1f0c62
+Revises: f2c86d19b4a7
+Create Date: 2026-10-18 19:12:40.305118
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a83d5e1f0c62"
+down_revision: str | Sequence[str] | None = "f2c86d19b4a7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("github_rate_limits", sa.Column("used", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("github_rate_limits", "used")
@@ -0,0 +1,36 @@
+"""Create github_rate_limits table
+
+Revision ID: b7e2c94f1d36
+Revises: 9a41d7c0e8f2
+Create Date: 2026-10-18 13:02:47.655120
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2c94f1d36"
+down_revision: str | Sequence[str] | None = "9a41d7c0e8f2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "github_rate_limits",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("remaining", sa.Integer(), nullable=True),
+        sa.Column("reset_at", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("next_slot", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("backoff_until", sa.Float(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("github_rate_limits")
@@ -0,0 +1,28 @@
+"""Add checkpoint_mode to sync_state
+
+Revision ID: c41e7b9d2a58
+Revises: a83d5e1f0c62
+Create Date: 2026-10-18 21:04:12.518342
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e7b9d2a58"
+down_revision: str | Sequence[str] | None = "a83d5e1f0c62"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("sync_state", sa.Column("checkpoint_mode", sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("sync_state", "checkpoint_mode")
@@ -0,0 +1,39 @@
+"""Scope issue numbers to repositories and add sync indexes
+
+Revision ID: d41f8a6c3e95
+Revises: b7e2c94f1d36
+Create Date: 2026-10-18 14:22:37.406115
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f8a6c3e95"
+down_revision: str | Sequence[str] | None = "b7e2c94f1d36"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index(op.f("ix_issues_number"), table_name="issues")
+    op.create_index(op.f("ix_issues_number"), "issues", ["number"], unique=False)
+    op.create_unique_constraint("uq_issues_owner_repo_number", "issues", ["owner", "repo", "number"])
+    # Redundant with the leading column of the unique key
+    op.drop_index(op.f("ix_issues_owner"), table_name="issues")
+    op.create_index("ix_issues_owner_repo_updated_at", "issues", ["owner", "repo", "updated_at"], unique=False)
+    op.create_index("ix_comments_issue_id_created_at", "comments", ["issue_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fails if the same issue number is now stored for several repositories
+    op.drop_index("ix_comments_issue_id_created_at", table_name="comments")
+    op.drop_index("ix_issues_owner_repo_updated_at", table_name="issues")
+    op.create_index(op.f("ix_issues_owner"), "issues", ["owner"], unique=False)
+    op.drop_constraint("uq_issues_owner_repo_number", "issues", type_="unique")
+    op.drop_index(op.f("ix_issues_number"), table_name="issues")
+    op.create_index(op.f("ix_issues_number"), "issues", ["number"], unique=True)
@@ -0,0 +1,45 @@
+"""Create embedding_outbox table
+
+Revision ID: e5b93c27a1f0
+Revises: d41f8a6c3e95
+Create Date: 2026-10-18 15:08:12.730481
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b93c27a1f0"
+down_revision: str | Sequence[str] | None = "d41f8a6c3e95"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "embedding_outbox",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("comment_id", sa.BigInteger(), nullable=False),
+        sa.Column("enqueued_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["comment_id"], ["comments.comment_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("comment_id"),
+    )
+    op.create_index(
+        "ix_embedding_outbox_pending",
+        "embedding_outbox",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("processed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_embedding_outbox_pending", table_name="embedding_outbox")
+    op.drop_table("embedding_outbox")
@@ -0,0 +1,56 @@
+"""Add full-text search vectors to issues and comments
+
+Revision ID: f2c86d19b4a7
+Revises: e5b93c27a1f0
+Create Date: 2026-10-18 16:31:54.902216
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c86d19b4a7"
+down_revision: str | Sequence[str] | None = "e5b93c27a1f0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated columns: existing rows are backfilled by the table rewrite
+    op.add_column(
+        "issues",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "comments",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', coalesce(body, ''))", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_issues_search_vector", "issues", ["search_vector"], unique=False, postgresql_using="gin")
+    op.create_index("ix_comments_search_vector", "comments", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_comments_search_vector", table_name="comments", postgresql_using="gin")
+    op.drop_index("ix_issues_search_vector", table_name="issues", postgresql_using="gin")
+    op.drop_column("comments", "search_vector")
+    op.drop_column("issues", "search_vector")
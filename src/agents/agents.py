@@ -1,9 +1,14 @@
+import asyncio
 import re
+from typing import Any
 
 from langchain_core.messages import AIMessage
+from loguru import logger
 
 from src.agents.graph_service import services
+from src.database.text_search import search_issues_lexical
 from src.models.agent_models import ClassificationState, IssueState, Recommendation
+from src.utils.config import settings
 from src.utils.error_handler import ErrorHandler
 from src.utils.guardrails import guardrail_validator
 from src.utils.promps import PromptTemplates
@@ -77,27 +82,41 @@ async def input_guardrail_agent(state: IssueState) -> IssueState:
 # ========================================
 
 
+async def vector_search(query_text: str) -> list[dict[str, Any]]:
+    results = await asyncio.wait_for(
+        services.qdrant_store.search_similar_issues(query_text), timeout=settings.VECTOR_SEARCH_TIMEOUT
+    )
+    return [
+        {
+            "issue_number": hit.payload.get("issue_number"),
+            "repo": hit.payload.get("repo"),
+            "owner": hit.payload.get("owner"),
+            "title": hit.payload.get("title"),
+            "url": hit.payload.get("url"),
+            "comment_id": hit.payload.get("comment_id"),
+            "chunk_text": hit.payload.get("chunk_text"),
+            "score": hit.score,
+            "is_bug": hit.payload.get("is_bug"),
+            "is_feature": hit.payload.get("is_feature"),
+        }
+        for hit in results
+        if hit.payload is not None
+    ]
+
+
 async def issue_search_agent(state: IssueState) -> IssueState:
     try:
         query_text = f"{getattr(state, 'title', '')} {getattr(state, 'body', '')}"
-        results = await services.qdrant_store.search_similar_issues(query_text)
-
-        similar_issues = [
-            {
-                "issue_number": hit.payload.get("issue_number"),
-                "repo": hit.payload.get("repo"),
-                "owner": hit.payload.get("owner"),
-                "title": hit.payload.get("title"),
-                "url": hit.payload.get("url"),
-                "comment_id": hit.payload.get("comment_id"),
-                "chunk_text": hit.payload.get("chunk_text"),
-                "score": hit.score,
-                "is_bug": hit.payload.get("is_bug"),
-                "is_feature": hit.payload.get("is_feature"),
-            }
-            for hit in results
-            if hit.payload is not None
-        ]
+        try:
+            similar_issues = await vector_search(query_text)
+        except Exception as e:
+            logger.warning(f"Vector search failed, falling back to full-text search: {e!r}")
+            similar_issues = []
+
+        if not similar_issues:
+            # Qdrant is down, too slow or found nothing: keep the graph going with lexical matches
+            async with services.async_db.session_scope() as session:
+                similar_issues = await search_issues_lexical(session, query_text)
 
         state.similar_issues = similar_issues
         return state
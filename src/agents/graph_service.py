@@ -3,6 +3,7 @@
 from langchain_openai import ChatOpenAI
 from loguru import logger
 
+from src.database.session import AsyncDB
 from src.models.agent_models import ResponseFormatter
 from src.utils.config import settings
 from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
@@ -12,6 +13,7 @@ class AgentServices:
     def __init__(self) -> None:
         # Initialize vector store
         self.qdrant_store = AsyncQdrantVectorStore()
+        self._async_db: AsyncDB | None = None
 
         # Try initializing the OpenAI Chat model
         try:
@@ -31,6 +33,13 @@ class AgentServices:
             logger.error(f"An error occurred while initializing ChatOpenAI: {e}")
             raise
 
+    @property
+    def async_db(self) -> AsyncDB:
+        # Only the lexical search fallback needs Postgres, so the pool is created on first use
+        if self._async_db is None:
+            self._async_db = AsyncDB()
+        return self._async_db
+
 
 # Instantiate the AgentServices
 services = AgentServices()
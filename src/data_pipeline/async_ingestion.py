@@ -0,0 +1,259 @@
+import asyncio
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import httpx
+from loguru import logger
+
+from src.data_pipeline.fast_decode import loads
+from src.data_pipeline.http_cache import ConditionalRequestCache
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.data_pipeline.rate_limit import RateLimitGovernor
+from src.data_pipeline.raw_archive import RawPayloadArchive
+from src.data_pipeline.token_pool import GitHubTokenPool
+from src.database.session import DB
+from src.database.upserts import fetch_comment_stats, fetch_issue_ids, fetch_issue_versions
+from src.models.github_models import AnyGitHubComment, AnyGitHubIssue
+from src.utils.config import settings
+
+if TYPE_CHECKING:
+    from src.models.repo_models import RepoConfig
+
+
+class AsyncGitHubIssuesCollector(GitHubIssuesCollector):
+    """Collector that fetches comment pages for many issues at once over a pooled keep-alive client.
+
+    Parsing and persistence are inherited from `GitHubIssuesCollector`, so the same
+    `Issue`/`Comment` rows are written as in the synchronous mode.
+    """
+
+    def __init__(
+        self,
+        db: DB,
+        token: str | None = None,
+        cache: ConditionalRequestCache | None = None,
+        max_concurrency: int = settings.GH_MAX_CONCURRENCY,
+        token_pool: GitHubTokenPool | None = None,
+        governor: RateLimitGovernor | None = None,
+        base_url: str = settings.GH_API_URL,
+        archive: RawPayloadArchive | None = None,
+        bulk_upserts: bool = False,
+        copy_load: bool = False,
+    ):
+        super().__init__(
+            db,
+            token,
+            cache,
+            bulk_upserts=bulk_upserts,
+            token_pool=token_pool,
+            governor=governor,
+            base_url=base_url,
+            archive=archive,
+            copy_load=copy_load,
+        )
+        self.max_concurrency = max_concurrency
+
+    def build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self.max_concurrency,
+            max_keepalive_connections=self.max_concurrency,
+        )
+        return httpx.AsyncClient(headers=self.headers, limits=limits, timeout=httpx.Timeout(30.0))
+
+    async def fetch_page(self, client: httpx.AsyncClient, url: str, params: dict[str, str]) -> list[dict[str, Any]] | None:
+        """Return the decoded page, or None when GitHub answers 304 Not Modified."""
+        conditional = self.conditional_headers(url, params)
+        resource = RateLimitGovernor.resource_for(url)
+        attempt = 0
+        while True:
+            headers = dict(conditional)
+            token = self.token_pool.acquire(resource) if self.token_pool else None
+            if token:
+                headers["Authorization"] = f"token {token}"
+            key = RateLimitGovernor.key_for(token or self.token, resource)
+            if self.governor:
+                delay = await asyncio.to_thread(self.governor.reserve, key)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            response = await client.get(url, params=params, headers=headers)
+            if token and self.token_pool:
+                self.token_pool.update(token, response.headers)
+            if not self.governor:
+                break
+            resource = RateLimitGovernor.resource_for(url, response.headers)
+            key = RateLimitGovernor.key_for(token or self.token, resource)
+            await asyncio.to_thread(self.governor.record, key, response.headers)
+            if attempt >= self.max_retries or not self.governor.is_rate_limited(
+                response.status_code, response.headers, response.text
+            ):
+                break
+            await asyncio.to_thread(self.governor.backoff, key, response.headers, attempt)
+            attempt += 1
+
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+
+        sleep_time = 0 if self.governor else self.rate_limit_sleep_time(response.headers)
+        if sleep_time:
+            logger.warning(f"Rate limit low. Sleeping for {sleep_time} seconds...")
+            await asyncio.sleep(sleep_time)
+
+        raw_items = loads(response.content) if self.fast_decode else response.json()
+        self.remember_validators(url, params, response.headers, len(raw_items))
+        return raw_items
+
+    async def get_issues_async(
+        self,
+        client: httpx.AsyncClient,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: str | None = None,
+        per_page: int = 100,
+        max_pages: int = 5,
+        since: datetime | None = None,
+    ) -> list[AnyGitHubIssue]:
+        issues = []
+        url = f"{self.base_url}/repos/{owner}/{repo}/issues"
+        # Incremental runs page by `since`, like `iter_issue_pages`, so mid-run updates cannot hide issues
+        position, page = since, 1
+        for _ in range(max_pages):
+            params = self.issue_list_params(state, labels, per_page, page, position)
+
+            logger.info(f"Fetching page {page} for {owner}/{repo}...")
+            try:
+                raw_issues = await self.fetch_page(client, url, params)
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching page {page}: {e}")
+                break
+
+            if raw_issues is None:
+                logger.info(f"Page {page} for {owner}/{repo} unchanged, skipping.")
+                if not self.cached_page_was_full(url, params, per_page):
+                    break
+                page += 1
+                continue
+            if not raw_issues:
+                break
+            self.archive_raw(owner, repo, "issues", raw_issues)
+            issues.extend(self.parse_issues(raw_issues))
+
+            if position is None:
+                page += 1
+                continue
+            if len(raw_issues) < per_page:
+                break
+            position, page = self.next_list_position(position, page, raw_issues)
+
+        return issues
+
+    async def get_issue_comments_async(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, owner: str, repo: str, issue_number: int
+    ) -> list[AnyGitHubComment]:
+        comments = []
+        page = 1
+        url = f"{self.base_url}/repos/{owner}/{repo}/issues/{issue_number}/comments"
+        async with semaphore:
+            while True:
+                params = {"per_page": "100", "page": str(page)}
+                try:
+                    raw_comments = await self.fetch_page(client, url, params)
+                except httpx.HTTPError as e:
+                    logger.error(f"Error fetching comments for issue #{issue_number}: {e}")
+                    break
+
+                if raw_comments is None:
+                    if not self.cached_page_was_full(url, params, 100):
+                        break
+                    page += 1
+                    continue
+                if not raw_comments:
+                    break
+                self.archive_raw(owner, repo, "comments", raw_comments, issue_number)
+                comments.extend(self.parse_comments(raw_comments))
+
+                if len(raw_comments) < 100:
+                    break
+                page += 1
+
+        return comments
+
+    def issues_needing_comments(self, issues: Sequence[AnyGitHubIssue], owner: str, repo: str) -> list[AnyGitHubIssue]:
+        """Issues that will be written and may have comments that are not stored yet, or changed since."""
+        candidates = {issue.number: issue for issue in issues if issue.body and issue.body.strip()}
+        with self.db.session_scope() as session:
+            versions = fetch_issue_versions(session, owner, repo, candidates)
+            changed = [
+                issue
+                for number, issue in candidates.items()
+                if self.force_rewrite
+                or number not in versions
+                or versions[number] != self.parse_github_datetime(issue.updated_at)
+            ]
+            issue_ids = fetch_issue_ids(session, owner, repo, [issue.number for issue in changed])
+            stored_stats = fetch_comment_stats(session, issue_ids.values())
+
+        return [
+            issue
+            for issue in changed
+            if self.has_new_comments(issue, stored_stats.get(issue_ids.get(issue.number, -1), (0, None)))
+        ]
+
+    async def collect(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: str | None = None,
+        per_page: int = 100,
+        max_pages: int = 5,
+        full_backfill: bool = False,
+    ) -> None:
+        started_at = datetime.now(UTC).replace(tzinfo=None, microsecond=0)
+        # Blocking DB work runs on worker threads, so other repositories keep downloading meanwhile
+        since = await asyncio.to_thread(self.resolve_watermark, owner, repo, full_backfill)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self.build_client() as client:
+            issues = await self.get_issues_async(client, owner, repo, state, labels, per_page, max_pages, since=since)
+            pending = await asyncio.to_thread(self.issues_needing_comments, issues, owner, repo)
+
+            logger.info(f"Fetching comments for {len(pending)} issues (concurrency={self.max_concurrency})...")
+            results = await asyncio.gather(
+                *(self.get_issue_comments_async(client, semaphore, owner, repo, issue.number) for issue in pending)
+            )
+
+        comments_by_issue = {issue.number: comments for issue, comments in zip(pending, results, strict=True)}
+        if not await asyncio.to_thread(self.save_issues_to_db, issues, owner, repo, comments_by_issue):
+            return
+
+        await asyncio.to_thread(self.commit_watermark, owner, repo, self.next_watermark(issues, since, started_at))
+
+
+async def collect_repositories_async(
+    collector: AsyncGitHubIssuesCollector,
+    repositories: Sequence["RepoConfig"],
+    max_parallel: int = 1,
+    full_backfill: bool = False,
+) -> None:
+    """Collect several repositories concurrently, `max_parallel` at a time."""
+    semaphore = asyncio.Semaphore(max(max_parallel, 1))
+
+    async def collect_one(repo_cfg: "RepoConfig") -> None:
+        async with semaphore:
+            logger.info(f"\n{'=' * 50}\nCollecting issues from {repo_cfg.owner}/{repo_cfg.repo}...\n{'=' * 50}")
+            try:
+                await collector.collect(
+                    owner=repo_cfg.owner,
+                    repo=repo_cfg.repo,
+                    state=repo_cfg.state,
+                    per_page=repo_cfg.per_page,
+                    max_pages=repo_cfg.max_pages,
+                    full_backfill=full_backfill,
+                )
+            except Exception as e:
+                logger.error(f"Collection of {repo_cfg.owner}/{repo_cfg.repo} failed: {e}")
+
+    await asyncio.gather(*(collect_one(repo_cfg) for repo_cfg in repositories))
@@ -0,0 +1,224 @@
+import argparse
+import tempfile
+import time
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+
+from src.data_pipeline.fake_github import FakeGitHubData, FakeGitHubServer
+from src.data_pipeline.http_cache import ConditionalRequestCache
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.database.session import DB
+from src.models.db_models import Comment, Issue, SyncCheckpoint, SyncState
+from src.models.github_models import AnyGitHubComment, AnyGitHubIssue
+
+BENCH_OWNER = "bench"
+BENCH_REPO = "fake"
+
+
+class BenchmarkResult(BaseModel):
+    run: int
+    issues: int
+    seconds: float
+    requests: int
+    not_modified: int
+    db_write_seconds: float
+
+    @property
+    def issues_per_second(self) -> float:
+        return self.issues / self.seconds if self.seconds else 0.0
+
+    @property
+    def requests_per_issue(self) -> float:
+        return self.requests / self.issues if self.issues else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"run {self.run}: {self.issues} issues in {self.seconds:.2f}s "
+            f"({self.issues_per_second:.1f} issues/s), {self.requests} requests "
+            f"({self.requests_per_issue:.2f}/issue, {self.not_modified} not modified), "
+            f"DB writes {self.db_write_seconds:.2f}s"
+        )
+
+
+class BenchmarkCollector(GitHubIssuesCollector):
+    """Collector that times its database writes and, with `write_db=False`, skips them entirely.
+
+    The fixed inter-page sleeps are skipped unless `pacing` is set, so runs measure the
+    ingestion path itself rather than the politeness delays.
+    """
+
+    def __init__(self, db: DB, write_db: bool = True, pacing: bool = False, **kwargs: Any) -> None:
+        super().__init__(db, **kwargs)
+        self.write_db = write_db
+        self.pacing = pacing
+        self.saved_issues = 0
+        self.db_write_seconds = 0.0
+
+    def pace(self, headers: Mapping[str, str], delay: float = 0) -> None:
+        if self.pacing:
+            super().pace(headers, delay)
+
+    def start_sync(self, owner: str, repo: str, full_backfill: bool) -> SyncCheckpoint:
+        if not self.write_db:
+            return SyncCheckpoint(
+                page=0, started_at=datetime.now(UTC).replace(tzinfo=None, microsecond=0), mode=self.sync_mode
+            )
+        return super().start_sync(owner, repo, full_backfill)
+
+    def commit_watermark(self, owner: str, repo: str, watermark: datetime) -> None:
+        if self.write_db:
+            super().commit_watermark(owner, repo, watermark)
+
+    def save_issues_to_db(
+        self,
+        issues: Sequence[AnyGitHubIssue],
+        owner: str,
+        repo: str,
+        comments_by_issue: Mapping[int, Sequence[AnyGitHubComment]] | None = None,
+        checkpoint: SyncCheckpoint | None = None,
+    ) -> bool:
+        self.saved_issues += len(issues)
+        if not self.write_db:
+            # Still download comments the way the per-issue path would, just without persisting them
+            if comments_by_issue is None:
+                for issue in issues:
+                    if issue.comments:
+                        self.get_issue_comments(owner, repo, issue.number)
+            if self.cache:
+                self.cache.save()
+            return True
+
+        start = time.perf_counter()
+        try:
+            return super().save_issues_to_db(issues, owner, repo, comments_by_issue, checkpoint)
+        finally:
+            # Includes comment downloads triggered from inside the save on the per-issue path
+            self.db_write_seconds += time.perf_counter() - start
+
+
+def delete_benchmark_rows(db: DB) -> None:
+    """Remove the issues, comments, outbox entries and sync state written for the fake repository."""
+    bench_issue_ids = select(Issue.id).where(Issue.owner == BENCH_OWNER, Issue.repo == BENCH_REPO)
+    with db.session_scope() as session:
+        # Outbox entries go with their comments through the foreign key's ON DELETE CASCADE
+        session.execute(delete(Comment).where(Comment.issue_id.in_(bench_issue_ids)))
+        session.execute(delete(Issue).where(Issue.owner == BENCH_OWNER, Issue.repo == BENCH_REPO))
+        session.execute(delete(SyncState).where(SyncState.owner == BENCH_OWNER, SyncState.repo == BENCH_REPO))
+
+
+def run_benchmark(
+    server: FakeGitHubServer,
+    db: DB,
+    write_db: bool = False,
+    pacing: bool = False,
+    fast_decode: bool = False,
+    runs: int = 1,
+    per_page: int = 100,
+    bulk_upserts: bool = False,
+    copy_load: bool = False,
+    bulk_comments: bool = False,
+    http_cache: ConditionalRequestCache | None = None,
+) -> list[BenchmarkResult]:
+    """Run full backfills of the fake repository and measure each one.
+
+    With an HTTP cache, later runs show how much of the work conditional requests save. Nothing
+    is written to `db` unless `write_db` is set, and the rows written then are deleted once the
+    runs finish, so the application's tables are left as they were.
+    """
+    results = []
+    max_pages = len(server.data.issues) // per_page + 1
+    try:
+        for run in range(1, runs + 1):
+            collector = BenchmarkCollector(
+                db,
+                write_db=write_db,
+                pacing=pacing,
+                cache=http_cache,
+                bulk_upserts=bulk_upserts,
+                copy_load=copy_load,
+                base_url=server.url,
+            )
+            collector.fast_decode = fast_decode
+            requests_before, not_modified_before = server.request_count, server.not_modified_count
+
+            start = time.perf_counter()
+            collector.sync_repo(
+                BENCH_OWNER,
+                BENCH_REPO,
+                per_page=per_page,
+                max_pages=max_pages,
+                full_backfill=True,
+                bulk_comments=bulk_comments,
+            )
+            elapsed = time.perf_counter() - start
+
+            results.append(
+                BenchmarkResult(
+                    run=run,
+                    issues=collector.saved_issues,
+                    seconds=elapsed,
+                    requests=server.request_count - requests_before,
+                    not_modified=server.not_modified_count - not_modified_before,
+                    db_write_seconds=collector.db_write_seconds,
+                )
+            )
+    finally:
+        if write_db:
+            delete_benchmark_rows(db)
+            logger.info(f"Deleted the benchmark rows of {BENCH_OWNER}/{BENCH_REPO}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the GitHub issues collector against a local fake GitHub API")
+    parser.add_argument("--issues", type=int, default=500, help="Number of synthetic issues")
+    parser.add_argument("--comments-per-issue", type=int, default=3, help="Number of synthetic comments per issue")
+    parser.add_argument("--fixture", help="JSON recording to serve instead of synthetic data")
+    parser.add_argument("--first-number", type=int, default=1_000_000, help="Number of the first synthetic issue")
+    parser.add_argument("--per-page", type=int, default=100, help="Issues requested per page")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Artificial server latency per request")
+    parser.add_argument("--runs", type=int, default=1, help="Number of consecutive backfills to measure")
+    parser.add_argument("--http-cache", action="store_true", help="Use a throwaway conditional-request cache")
+    parser.add_argument("--bulk-upserts", action="store_true", help="Write issues and comments with set-based upserts")
+    parser.add_argument("--copy-load", action="store_true", help="Write issues and comments through COPY")
+    parser.add_argument("--bulk-comments", action="store_true", help="Fetch comments from the repository-wide endpoint")
+    parser.add_argument("--pacing", action="store_true", help="Keep the collector's fixed sleeps between pages")
+    parser.add_argument("--fast-decode", action="store_true", help="Decode with orjson into slotted dataclasses")
+    parser.add_argument(
+        "--write-db",
+        action="store_true",
+        help="Also measure database writes; the rows are written to the configured database and deleted afterwards",
+    )
+    args = parser.parse_args()
+
+    if args.fixture:
+        data = FakeGitHubData.from_file(args.fixture)
+    else:
+        data = FakeGitHubData.synthetic(
+            BENCH_OWNER, BENCH_REPO, args.issues, args.comments_per_issue, first_number=args.first_number
+        )
+
+    with tempfile.TemporaryDirectory() as cache_dir, FakeGitHubServer(data, latency=args.latency_ms / 1000) as server:
+        logger.info(f"Fake GitHub API serving {len(data.issues)} issues at {server.url}")
+        cache = ConditionalRequestCache(path=f"{cache_dir}/http_cache.json") if args.http_cache else None
+        results = run_benchmark(
+            server,
+            DB(),
+            write_db=args.write_db,
+            pacing=args.pacing,
+            fast_decode=args.fast_decode,
+            runs=args.runs,
+            per_page=args.per_page,
+            bulk_upserts=args.bulk_upserts,
+            copy_load=args.copy_load,
+            bulk_comments=args.bulk_comments,
+            http_cache=cache,
+        )
+
+    for result in results:
+        logger.info(result.summary())
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+ISSUES_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues$")
+ISSUE_COMMENTS_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues/(?P<number>\d+)/comments$")
+REPO_COMMENTS_PATH = re.compile(r"^/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues/comments$")
+
+
+class FakeGitHubData:
+    """Issues and comments served by `FakeGitHubServer`, either synthetic or loaded from a recording.
+
+    A recording is a JSON file `{"issues": [...], "comments": {"<number>": [...]}}` holding raw
+    REST payloads, e.g. saved from a real collector run.
+    """
+
+    def __init__(self, issues: list[dict[str, Any]], comments: dict[int, list[dict[str, Any]]]) -> None:
+        self.issues = issues
+        self.comments = comments
+
+    @classmethod
+    def synthetic(
+        cls, owner: str, repo: str, num_issues: int, comments_per_issue: int, first_number: int = 1
+    ) -> "FakeGitHubData":
+        base = datetime(2025, 1, 1, tzinfo=UTC)
+        issues: list[dict[str, Any]] = []
+        comments: dict[int, list[dict[str, Any]]] = {}
+        comment_id = first_number * 1000
+        for offset in range(num_issues):
+            number = first_number + offset
+            created = base + timedelta(minutes=offset)
+            issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{number}"
+            issues.append(
+                {
+                    "number": number,
+                    "title": f"Synthetic issue {number}",
+                    "body": f"Steps to reproduce issue {number}.\n\n```python\nraise RuntimeError({number})\n```",
+                    "state": "open" if offset % 3 else "closed",
+                    "user": {"login": f"user{offset % 17}"},
+                    "html_url": f"https://github.com/{owner}/{repo}/issues/{number}",
+                    "created_at": created.isoformat().replace("+00:00", "Z"),
+                    "updated_at": (created + timedelta(hours=1)).isoformat().replace("+00:00", "Z"),
+                    "labels": [{"name": "bug" if offset % 2 else "enhancement"}],
+                    "comments": comments_per_issue,
+                }
+            )
+            comments[number] = []
+            for index in range(comments_per_issue):
+                comment_id += 1
+                stamp = (created + timedelta(hours=2, minutes=index)).isoformat().replace("+00:00", "Z")
+                comments[number].append(
+                    {
+                        "id": comment_id,
+                        "user": {"login": f"user{index % 11}"},
+                        "body": f"Comment {index} on issue {number}: tried the workaround, still failing.",
+                        "created_at": stamp,
+                        "updated_at": stamp,
+                        "issue_url": issue_url,
+                    }
+                )
+        return cls(issues, comments)
+
+    @classmethod
+    def from_file(cls, path: str) -> "FakeGitHubData":
+        data = json.loads(Path(path).read_text())
+        return cls(data["issues"], {int(number): comments for number, comments in data.get("comments", {}).items()})
+
+
+class FakeGitHubServer:
+    """Local stand-in for the GitHub REST API used to benchmark and test collectors offline.
+
+    Serves `/issues`, `/issues/{number}/comments` and `/issues/comments` with `page`/`per_page`
+    pagination, `since` filtering, ETags answered with 304, `X-RateLimit-*` headers and a 403
+    once the configured quota is spent. Every request is counted in `request_count`.
+    """
+
+    def __init__(self, data: FakeGitHubData, rate_limit: int = 5000, latency: float = 0.0) -> None:
+        self.data = data
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.handler_class())
+        self.thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def route(self, path: str, query: dict[str, str]) -> list[dict[str, Any]] | None:
+        if ISSUES_PATH.match(path):
+            items = self.data.issues
+            if query.get("state", "all") != "all":
+                items = [issue for issue in items if issue["state"] == query["state"]]
+            sort_key = "updated_at" if query.get("sort") == "updated" else "created_at"
+            return self.filter_and_sort(items, query, sort_key)
+        if match := ISSUE_COMMENTS_PATH.match(path):
+            return self.data.comments.get(int(match["number"]), [])
+        if REPO_COMMENTS_PATH.match(path):
+            items = [comment for comments in self.data.comments.values() for comment in comments]
+            return self.filter_and_sort(items, query, "updated_at")
+        return None
+
+    @staticmethod
+    def filter_and_sort(items: list[dict[str, Any]], query: dict[str, str], sort_key: str) -> list[dict[str, Any]]:
+        if since := query.get("since"):
+            items = [item for item in items if item["updated_at"] >= since]
+        return sorted(items, key=lambda item: item[sort_key], reverse=query.get("direction", "desc") == "desc")
+
+    def respond(self, path: str, query: dict[str, str], if_none_match: str | None) -> tuple[int, dict[str, str], bytes]:
+        if self.latency:
+            time.sleep(self.latency)
+
+        items = self.route(path, query)
+        if items is None:
+            return 404, {}, b'{"message": "Not Found"}'
+
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        body = json.dumps(items[(page - 1) * per_page : page * per_page]).encode()
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+        with self.lock:
+            self.request_count += 1
+            if if_none_match == etag:
+                # Like GitHub, conditional hits do not count against the quota
+                self.not_modified_count += 1
+                return 304, {"ETag": etag, **self.rate_limit_headers()}, b""
+            if self.remaining <= 0:
+                return 403, self.rate_limit_headers(), b'{"message": "API rate limit exceeded"}'
+            self.remaining -= 1
+            return 200, {"ETag": etag, "Content-Type": "application/json", **self.rate_limit_headers()}, body
+
+    def rate_limit_headers(self) -> dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+        }
+
+    def handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; avoid the delayed-ACK stall on keep-alive connections
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                parsed = urlparse(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+                status, headers, body = server.respond(parsed.path, query, self.headers.get("If-None-Match"))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
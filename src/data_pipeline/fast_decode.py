@@ -0,0 +1,72 @@
+import dataclasses
+from typing import Any
+
+import orjson
+
+from src.models.github_models import (
+    AnyGitHubComment,
+    AnyGitHubIssue,
+    FastGitHubComment,
+    FastGitHubIssue,
+    FastGitHubLabel,
+    FastGitHubUser,
+)
+
+
+def loads(content: bytes) -> Any:
+    """Decode a JSON response body with orjson."""
+    return orjson.loads(content)
+
+
+def _required(data: dict[str, Any], key: str) -> Any:
+    # The pydantic models reject missing or null required fields; keep rejecting the same payloads
+    value = data.get(key)
+    if value is None:
+        raise ValueError(f"missing required field '{key}'")
+    return value
+
+
+def _present(data: dict[str, Any], key: str) -> Any:
+    # Required but nullable in the pydantic models: the key must exist, null is fine
+    if key not in data:
+        raise ValueError(f"missing required field '{key}'")
+    return data[key]
+
+
+def _user(data: dict[str, Any]) -> FastGitHubUser:
+    return FastGitHubUser(login=_required(_required(data, "user"), "login"))
+
+
+def decode_issue(data: dict[str, Any]) -> FastGitHubIssue:
+    """Build a `FastGitHubIssue` from a REST issue payload, reading only the fields the collectors use."""
+    raw_labels = data.get("labels", [])
+    return FastGitHubIssue(
+        number=_required(data, "number"),
+        title=_required(data, "title"),
+        body=_present(data, "body"),
+        state=_required(data, "state"),
+        user=_user(data),
+        html_url=_required(data, "html_url"),
+        created_at=_required(data, "created_at"),
+        updated_at=_required(data, "updated_at"),
+        labels=None if raw_labels is None else [FastGitHubLabel(name=_required(label, "name")) for label in raw_labels],
+        comments=data.get("comments"),
+    )
+
+
+def decode_comment(data: dict[str, Any]) -> FastGitHubComment:
+    return FastGitHubComment(
+        id=_required(data, "id"),
+        user=_user(data),
+        body=_required(data, "body"),
+        created_at=_present(data, "created_at"),
+        updated_at=_present(data, "updated_at"),
+        issue_url=data.get("issue_url"),
+    )
+
+
+def to_payload(item: AnyGitHubIssue | AnyGitHubComment) -> dict[str, Any]:
+    """REST-shaped dict of either model kind, e.g. for the raw payload archive."""
+    if isinstance(item, FastGitHubIssue | FastGitHubComment):
+        return dataclasses.asdict(item)
+    return item.model_dump()
@@ -0,0 +1,344 @@
+import time
+from collections import defaultdict
+from collections.abc import Generator
+from datetime import UTC, datetime
+from typing import Any
+
+import requests
+from loguru import logger
+
+from src.data_pipeline.fast_decode import to_payload
+from src.data_pipeline.http_cache import ConditionalRequestCache
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.data_pipeline.rate_limit import RateLimitGovernor
+from src.data_pipeline.raw_archive import RawPayloadArchive
+from src.data_pipeline.token_pool import GitHubTokenPool
+from src.database.session import DB
+from src.models.db_models import SyncCheckpoint
+from src.models.github_models import AnyGitHubComment, GitHubIssue, GitHubLabel, GitHubUser
+from src.utils.config import settings
+
+ISSUES_QUERY = """
+query (
+  $owner: String!
+  $repo: String!
+  $pageSize: Int!
+  $cursor: String
+  $commentsFirst: Int!
+  $states: [IssueState!]
+  $labels: [String!]
+  $since: DateTime
+  $orderBy: IssueOrder
+) {
+  rateLimit {
+    cost
+    remaining
+    resetAt
+  }
+  repository(owner: $owner, name: $repo) {
+    issues(
+      first: $pageSize
+      after: $cursor
+      states: $states
+      labels: $labels
+      orderBy: $orderBy
+      filterBy: {since: $since}
+    ) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        title
+        body
+        state
+        url
+        createdAt
+        updatedAt
+        author {
+          login
+        }
+        labels(first: 20) {
+          nodes {
+            name
+          }
+        }
+        comments(first: $commentsFirst) {
+          totalCount
+          nodes {
+            fullDatabaseId
+            body
+            createdAt
+            updatedAt
+            author {
+              login
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+MIN_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 100
+# Gateway errors GitHub returns when a nested query times out; a smaller page can succeed
+QUERY_TIMEOUT_STATUSES = {502, 504}
+
+
+class GitHubGraphQLError(RuntimeError):
+    """The GraphQL API answered with an `errors` payload."""
+
+
+class GitHubGraphQLCollector(GitHubIssuesCollector):
+    """Fetch issues (never pull requests) with labels and their first comments nested, via GraphQL.
+
+    The page size adapts to the `rateLimit.cost` GitHub reports for each query, so large
+    repositories are read with as few points as possible without hitting query timeouts.
+    """
+
+    sync_mode = "graphql"
+
+    def __init__(
+        self,
+        db: DB,
+        token: str | None = None,
+        cache: ConditionalRequestCache | None = None,
+        page_size: int = settings.GH_GRAPHQL_PAGE_SIZE,
+        comments_first: int = settings.GH_GRAPHQL_COMMENTS_FIRST,
+        max_query_cost: int = settings.GH_GRAPHQL_MAX_COST,
+        bulk_upserts: bool = False,
+        token_pool: GitHubTokenPool | None = None,
+        governor: RateLimitGovernor | None = None,
+        base_url: str = settings.GH_API_URL,
+        archive: RawPayloadArchive | None = None,
+        copy_load: bool = False,
+    ):
+        super().__init__(db, token, cache, bulk_upserts, token_pool, governor, base_url, archive, copy_load)
+        if not (token or token_pool):
+            logger.warning("The GitHub GraphQL API requires a token; requests will be rejected.")
+        self.graphql_url = f"{self.base_url}/graphql"
+        self.page_size = max(MIN_PAGE_SIZE, min(page_size, MAX_PAGE_SIZE))
+        self.comments_first = max(0, min(comments_first, 100))
+        self.max_query_cost = max_query_cost
+
+    def next_page_size(self, page_size: int, cost: int) -> int:
+        """Scale the page size so the next query costs about `max_query_cost` points."""
+        if cost <= 0:
+            return page_size
+        scaled = int(page_size * self.max_query_cost / cost)
+        return max(MIN_PAGE_SIZE, min(scaled, MAX_PAGE_SIZE))
+
+    @staticmethod
+    def is_query_timeout(error: requests.RequestException) -> bool:
+        if isinstance(error, requests.Timeout):
+            return True
+        response = error.response if isinstance(error, requests.HTTPError) else None
+        return response is not None and response.status_code in QUERY_TIMEOUT_STATUSES
+
+    def wait_for_budget(self, rate_limit: dict[str, Any]) -> None:
+        """Sleep until the reset when the GraphQL budget is nearly spent; with a governor, `request()` paces."""
+        if self.governor:
+            return
+        remaining = int(rate_limit.get("remaining", 0))
+        cost = int(rate_limit.get("cost", 1))
+        if remaining >= max(cost, 1) * 2:
+            return
+        reset_at = self.parse_github_datetime(rate_limit.get("resetAt"))
+        if reset_at is None:
+            return
+        now = datetime.now(UTC).replace(tzinfo=None)
+        sleep_time = max((reset_at - now).total_seconds() + 1, 0)
+        logger.warning(f"GraphQL rate limit low ({remaining} points left). Sleeping for {sleep_time:.0f} seconds...")
+        time.sleep(sleep_time)
+
+    def query_variables(
+        self,
+        owner: str,
+        repo: str,
+        state: str,
+        labels: str | None,
+        page_size: int,
+        cursor: str | None,
+        since: datetime | None,
+    ) -> dict[str, Any]:
+        return {
+            "owner": owner,
+            "repo": repo,
+            "pageSize": page_size,
+            "cursor": cursor,
+            "commentsFirst": self.comments_first,
+            "states": None if state == "all" else [state.upper()],
+            "labels": [label.strip() for label in labels.split(",")] if labels else None,
+            "since": since.isoformat() + "Z" if since else None,
+            # Same ordering as the REST path: oldest change first when incremental, newest issue first otherwise
+            "orderBy": {"field": "UPDATED_AT", "direction": "ASC"}
+            if since
+            else {"field": "CREATED_AT", "direction": "DESC"},
+        }
+
+    def parse_issue_node(self, node: dict[str, Any]) -> tuple[GitHubIssue, list[AnyGitHubComment]]:
+        issue = GitHubIssue(
+            number=node["number"],
+            title=node["title"],
+            body=node.get("body"),
+            state=node["state"].lower(),
+            user=GitHubUser(login=(node.get("author") or {}).get("login", "ghost")),
+            html_url=node["url"],
+            created_at=node["createdAt"],
+            updated_at=node["updatedAt"],
+            labels=[GitHubLabel(name=label["name"]) for label in node["labels"]["nodes"]],
+            comments=node["comments"]["totalCount"],
+        )
+        comments = self.parse_comments(
+            [
+                {
+                    # `databaseId` is a 32-bit Int that comment ids have outgrown; the BigInt comes as a string
+                    "id": int(comment["fullDatabaseId"]),
+                    "user": {"login": (comment.get("author") or {}).get("login", "ghost")},
+                    "body": comment["body"],
+                    "created_at": comment["createdAt"],
+                    "updated_at": comment["updatedAt"],
+                }
+                for comment in node["comments"]["nodes"]
+            ]
+        )
+        return issue, comments
+
+    def iter_graphql_pages(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: str | None = None,
+        max_pages: int = 5,
+        since: datetime | None = None,
+        start_page: int = 1,
+        cursor: str | None = None,
+    ) -> Generator[tuple[int, str | None, list[GitHubIssue], dict[int, list[AnyGitHubComment]]], None, None]:
+        """Yield `(page, end_cursor, issues, comments_by_issue)` one page at a time.
+
+        Raises `requests.RequestException` or `GitHubGraphQLError` when a page cannot be fetched.
+        """
+        page_size = self.page_size
+        page = start_page
+
+        while page <= max_pages:
+            variables = self.query_variables(owner, repo, state, labels, page_size, cursor, since)
+            logger.info(f"Fetching GraphQL page {page} ({page_size} issues) for {owner}/{repo}...")
+            try:
+                response = self.request("POST", self.graphql_url, json={"query": ISSUES_QUERY, "variables": variables})
+                response.raise_for_status()
+            except requests.RequestException as e:
+                # Large nested pages can time out on GitHub's side; retry the same cursor with a smaller page.
+                # Auth, not-found and rate-limit errors would fail the same way, so they are raised at once
+                if page_size > MIN_PAGE_SIZE and self.is_query_timeout(e):
+                    page_size = max(MIN_PAGE_SIZE, page_size // 2)
+                    logger.warning(f"GraphQL page {page} failed ({e}), retrying with {page_size} issues per page.")
+                    continue
+                logger.error(f"Error fetching GraphQL page {page}: {e}")
+                raise
+
+            payload = response.json()
+            if payload.get("errors"):
+                logger.error(f"GraphQL errors for {owner}/{repo}: {payload['errors']}")
+                raise GitHubGraphQLError(str(payload["errors"]))
+
+            data = payload["data"]
+            connection = data["repository"]["issues"]
+            issues: list[GitHubIssue] = []
+            comments_by_issue: dict[int, list[AnyGitHubComment]] = defaultdict(list)
+            for node in connection["nodes"]:
+                try:
+                    issue, comments = self.parse_issue_node(node)
+                except Exception as e:
+                    logger.error(f"Failed to parse issue: {e}")
+                    continue
+                issues.append(issue)
+                comments_by_issue[issue.number].extend(comments)
+                # Archived in the REST payload shape, so replay parses both modes the same way
+                self.archive_raw(owner, repo, "comments", [to_payload(comment) for comment in comments], issue.number)
+            self.archive_raw(owner, repo, "issues", [issue.model_dump() for issue in issues])
+
+            rate_limit = data.get("rateLimit") or {}
+            page_size = self.next_page_size(page_size, int(rate_limit.get("cost", 0)))
+            self.wait_for_budget(rate_limit)
+
+            cursor = connection["pageInfo"]["endCursor"]
+            yield page, cursor, issues, comments_by_issue
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            page += 1
+
+    def fetch_issues_with_comments(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: str | None = None,
+        max_pages: int = 5,
+        since: datetime | None = None,
+    ) -> tuple[list[GitHubIssue], dict[int, list[AnyGitHubComment]]]:
+        issues: list[GitHubIssue] = []
+        comments_by_issue: dict[int, list[AnyGitHubComment]] = defaultdict(list)
+        try:
+            for _, _, page_issues, page_comments in self.iter_graphql_pages(owner, repo, state, labels, max_pages, since):
+                issues.extend(page_issues)
+                for number, comments in page_comments.items():
+                    comments_by_issue[number].extend(comments)
+        except (requests.RequestException, GitHubGraphQLError):
+            # Already logged; keep the pages fetched so far
+            pass
+        return issues, comments_by_issue
+
+    def complete_comments(
+        self, owner: str, repo: str, issues: list[GitHubIssue], comments_by_issue: dict[int, list[AnyGitHubComment]]
+    ) -> None:
+        for issue in issues:
+            nested = comments_by_issue[issue.number]
+            if issue.comments and issue.comments > len(nested):
+                # Only the first `comments_first` comments are nested; page the rest through REST
+                comments_by_issue[issue.number] = self.get_issue_comments(owner, repo, issue.number)
+
+    def sync_repo(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: str | None = None,
+        per_page: int = 100,
+        max_pages: int = 5,
+        full_backfill: bool = False,
+        bulk_comments: bool = False,
+    ) -> None:
+        """GraphQL counterpart of `GitHubIssuesCollector.sync_repo`, checkpointing the page cursor.
+
+        `per_page` and `bulk_comments` are accepted for interface compatibility; page size is
+        cost-driven and comments always arrive nested.
+        """
+        run = self.start_sync(owner, repo, full_backfill)
+        since = run.since
+        newest_update = since
+
+        try:
+            pages = self.iter_graphql_pages(
+                owner, repo, state, labels, max_pages, since, start_page=(run.page or 0) + 1, cursor=run.cursor
+            )
+            for page, cursor, issues, comments_by_issue in pages:
+                self.complete_comments(owner, repo, issues, comments_by_issue)
+                checkpoint = SyncCheckpoint(
+                    page=page, cursor=cursor, since=since, started_at=run.started_at, mode=self.sync_mode
+                )
+                if not self.save_issues_to_db(issues, owner, repo, comments_by_issue, checkpoint=checkpoint):
+                    logger.warning(f"Stopping sync of {owner}/{repo}; the next run resumes after the last saved page.")
+                    return
+                if since:
+                    newest_update = self.next_watermark(issues, newest_update, run.started_at)
+        except (requests.RequestException, GitHubGraphQLError):
+            logger.warning(f"Sync of {owner}/{repo} interrupted; the next run resumes after the last saved page.")
+            return
+
+        self.commit_watermark(owner, repo, newest_update or run.started_at)
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+from collections.abc import Mapping
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from loguru import logger
+
+from src.utils.config import settings
+
+
+class ConditionalRequestCache:
+    """Persistent on-disk store of ETag / Last-Modified validators per request URL.
+
+    Validators are staged with `store()` and only written to disk by `save()`, so a page
+    whose rows were rolled back is downloaded again on the next run instead of being
+    answered with a 304. Staged validators live in a context variable, so collectors running
+    in parallel threads or asyncio tasks only save or discard their own pages.
+    """
+
+    def __init__(self, path: str = settings.GH_HTTP_CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.entries: dict[str, dict[str, Any]] = self._load()
+        self.lock = threading.Lock()
+        self.pending_var: ContextVar[dict[str, dict[str, Any]] | None] = ContextVar(
+            f"http_cache_pending_{id(self)}", default=None
+        )
+
+    @property
+    def pending(self) -> dict[str, dict[str, Any]]:
+        pending = self.pending_var.get()
+        if pending is None:
+            pending = {}
+            self.pending_var.set(pending)
+        return pending
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with self.path.open() as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable HTTP cache at {self.path}: {e}")
+            return {}
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, str] | None = None) -> str:
+        return f"{url}?{urlencode(sorted((params or {}).items()))}"
+
+    def get(self, url: str, params: Mapping[str, str] | None = None) -> dict[str, Any] | None:
+        key = self.key(url, params)
+        return self.pending.get(key) or self.entries.get(key)
+
+    def conditional_headers(self, url: str, params: Mapping[str, str] | None = None) -> dict[str, str]:
+        entry = self.get(url, params)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, params: Mapping[str, str] | None, headers: Mapping[str, str], item_count: int) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+        self.pending[self.key(url, params)] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "item_count": item_count,
+        }
+
+    def save(self) -> None:
+        if not self.pending:
+            return
+        with self.lock:
+            self.entries.update(self.pending)
+            self.pending.clear()
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with tmp_path.open("w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+
+    def discard(self) -> None:
+        self.pending.clear()
@@ -1,20 +1,27 @@
+import argparse
 import asyncio
-import textwrap
+import hashlib
 import uuid
 from collections.abc import AsyncGenerator, Generator, Iterable
-from typing import Any
+from datetime import datetime
+from typing import Any, cast
 
 from loguru import logger
-from qdrant_client.models import Batch, FieldCondition, Filter, MatchValue
+from qdrant_client.models import Batch, FieldCondition, Filter, FilterSelector, MatchValue, Range
+from sqlalchemy import Table, and_, bindparam, func, select, update
 
-from src.database.session import db
-from src.models.db_models import Comment, Issue
-from src.vectorstore.payload_builder import BATCH_SIZE, CHUNK_SIZE, CONCURRENT_COMMENTS, build_comment_payload
+from src.database.session import AsyncDB
+from src.models.db_models import Comment, EmbeddingOutbox, Issue
+from src.utils.config import settings
+from src.vectorstore.chunker import CHUNKER_VERSION, TextChunker
+from src.vectorstore.embedding_cache import EmbeddingCache
+from src.vectorstore.payload_builder import BATCH_SIZE, build_comment_payload
 from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
 
 
-def split_text_into_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> list[str]:
-    return textwrap.wrap(text, width=chunk_size, break_long_words=False)
+def create_vectorstore() -> AsyncQdrantVectorStore:
+    # Rebuilding a collection re-embeds every chunk, so ingestion reuses vectors across runs
+    return AsyncQdrantVectorStore(cache=EmbeddingCache() if settings.EMBEDDING_CACHE_PATH else None)
 
 
 def batch_iterable(iterable: Iterable[Any], batch_size: int = BATCH_SIZE) -> Generator[list[Any], None, None]:
@@ -28,120 +35,312 @@ def batch_iterable(iterable: Iterable[Any], batch_size: int = BATCH_SIZE) -> Gen
         yield batch
 
 
-async def comment_already_ingested(qdrant: AsyncQdrantVectorStore, issue_number: int, comment_id: int) -> bool:
-    points, _ = await qdrant.client.scroll(
-        collection_name=qdrant.collection_name,
-        scroll_filter=Filter(
-            must=[
-                FieldCondition(key="issue_number", match=MatchValue(value=issue_number)),
-                FieldCondition(key="comment_id", match=MatchValue(value=comment_id)),
-            ]
-        ),
-        limit=1,
-    )
-    return len(points) > 0
+# Point ids are derived from (comment_id, chunk_index), so re-embedding a comment overwrites it in place
+POINT_ID_NAMESPACE = uuid.UUID("36b53814-17c4-4a56-8be2-2cf5565229c6")
+# Changing any of these changes the stored chunks or vectors, so it is folded into the content hash
+EMBEDDING_VERSION = (
+    f"{settings.DENSE_MODEL_NAME}|{settings.SPARSE_MODEL_NAME}|"
+    f"chunker-{CHUNKER_VERSION}:{settings.CHUNK_MAX_TOKENS}:{settings.CHUNK_OVERLAP_TOKENS}"
+)
+MANIFEST_PAGE_SIZE = 1000
+
+
+def chunk_point_id(comment_id: int, chunk_index: int) -> str:
+    return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{comment_id}:{chunk_index}"))
+
 
+def content_hash(body: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_VERSION}\n{body}".encode()).hexdigest()
 
-async def chunk_data_for_comment(
-    comment: Comment, issue: Issue, qdrant: AsyncQdrantVectorStore
-) -> AsyncGenerator[dict, None]:
-    chunks = split_text_into_chunks(comment.body or "")
-    for chunk in chunks:
-        dense = await qdrant.dense_vectors([chunk])
-        sparse = await qdrant.sparse_vectors([chunk])
+
+def comment_chunk_payloads(comment: Comment, issue: Issue, chunker: TextChunker) -> list[dict[str, Any]]:
+    body = comment.body or ""
+    body_hash = content_hash(body)
+    payloads = []
+    for chunk_index, chunk in enumerate(chunker.split(body)):
         payload = build_comment_payload(comment, issue)
         payload["chunk_text"] = chunk
+        payload["chunk_index"] = chunk_index
+        payload["content_hash"] = body_hash
+        payloads.append(payload)
+    return payloads
+
+
+async def load_ingestion_manifest(
+    qdrant: AsyncQdrantVectorStore, page_size: int = MANIFEST_PAGE_SIZE
+) -> dict[int, str | None]:
+    """`{comment_id: content_hash}` of every stored comment, from one paginated payload-only scroll.
+
+    Only first chunks are read, one per comment; points written before chunks were indexed are
+    left out, so their comments are embedded again.
+    """
+    manifest: dict[int, str | None] = {}
+    offset = None
+    while True:
+        points, offset = await qdrant.client.scroll(
+            collection_name=qdrant.collection_name,
+            scroll_filter=Filter(must=[FieldCondition(key="chunk_index", match=MatchValue(value=0))]),
+            with_payload=["comment_id", "content_hash"],
+            with_vectors=False,
+            limit=page_size,
+            offset=offset,
+        )
+        for point in points:
+            if point.payload:
+                manifest[point.payload["comment_id"]] = point.payload.get("content_hash")
+        if offset is None:
+            return manifest
+
 
-        yield {
-            "id": uuid.uuid4().hex,
-            "dense": dense[0],
-            "sparse": sparse[0].as_dict() if hasattr(sparse[0], "as_dict") else sparse[0],
-            "payload": payload,
-        }
+async def load_stored_hashes(qdrant: AsyncQdrantVectorStore, comment_ids: list[int]) -> dict[int, str | None]:
+    """`{comment_id: content_hash}` of these comments, read from their first chunks by point id."""
+    if not comment_ids:
+        return {}
+    points = await qdrant.client.retrieve(
+        collection_name=qdrant.collection_name,
+        ids=[chunk_point_id(comment_id, 0) for comment_id in comment_ids],
+        with_payload=["comment_id", "content_hash"],
+        with_vectors=False,
+    )
+    return {point.payload["comment_id"]: point.payload.get("content_hash") for point in points if point.payload}
 
 
-async def upsert_comment_chunks(qdrant: AsyncQdrantVectorStore, comment: Comment, issue: Issue) -> bool:
-    if not comment.body:
-        logger.info(f"Skipping empty comment {comment.comment_id} in issue #{issue.number}")
-        return False
+def stale_chunks_filter(chunk_counts: dict[int, int]) -> Filter:
+    """Points of these comments beyond their current chunk count, including points without a `chunk_index`."""
+    return Filter(
+        should=[
+            Filter(
+                must=[FieldCondition(key="comment_id", match=MatchValue(value=comment_id))],
+                must_not=[FieldCondition(key="chunk_index", range=Range(lt=count))],
+            )
+            for comment_id, count in chunk_counts.items()
+        ]
+    )
 
-    if await comment_already_ingested(qdrant, int(issue.number), comment.comment_id):
-        logger.info(f"Skipping comment {comment.comment_id} in issue #{issue.number} — already ingested.")
-        return False
 
-    chunk_gen = chunk_data_for_comment(comment, issue, qdrant)
-    batches_for_comment = 0
+async def upsert_comments_batched(
+    qdrant: AsyncQdrantVectorStore,
+    rows: Iterable[tuple[Comment, Issue]],
+    embed_batch_size: int = settings.EMBED_BATCH_SIZE,
+) -> set[int]:
+    """Embed and store the chunks of many comments, replacing whatever was stored for them before.
 
-    async for batch in async_batch_iterable(chunk_gen, batch_size=BATCH_SIZE):
-        ids = [item["id"] for item in batch]
-        dense_vectors = [item["dense"] for item in batch]
-        sparse_vectors = [item["sparse"] for item in batch]
-        payloads = [item["payload"] for item in batch]
+    Chunks from different comments and issues share embedding batches of `embed_batch_size`,
+    so fastembed runs few large batches instead of one model call per chunk. Upserts of one
+    batch run while the next batch is being embedded. Returns the ids of the comments that
+    were fully stored; a comment without text just has its old points removed.
+    """
+    rows = list(rows)
+    chunk_payloads = [
+        payload for comment, issue in rows for payload in comment_chunk_payloads(comment, issue, qdrant.chunker)
+    ]
+    chunk_counts = {comment.comment_id: 0 for comment, _ in rows}
+    for payload in chunk_payloads:
+        chunk_counts[payload["comment_id"]] += 1
+    failed: set[int] = set()
 
+    async def upsert(batch: list[tuple[dict[str, Any], list[float], Any]]) -> None:
         try:
             await qdrant.client.upsert(
                 collection_name=qdrant.collection_name,
                 points=Batch(
-                    ids=ids,
-                    payloads=payloads,
-                    vectors={"dense": dense_vectors, "miniCOIL": sparse_vectors},
+                    ids=[chunk_point_id(payload["comment_id"], payload["chunk_index"]) for payload, _, _ in batch],
+                    payloads=[payload for payload, _, _ in batch],
+                    vectors={
+                        "dense": [dense for _, dense, _ in batch],
+                        "miniCOIL": [sparse for _, _, sparse in batch],
+                    },
                 ),
             )
-            batches_for_comment += 1
         except Exception as upsert_error:
-            logger.error(f"Failed to upsert comment {comment.comment_id}: {upsert_error}")
+            comment_ids = {payload["comment_id"] for payload, _, _ in batch}
+            logger.error(f"Failed to upsert chunks of comments {sorted(comment_ids)}: {upsert_error}")
+            failed.update(comment_ids)
 
-    if batches_for_comment > 0:
-        logger.info(f"Upserted {batches_for_comment} batch(es) for comment {comment.comment_id} in issue #{issue.number}")
-        return True
-    return False
+    upserts: list[asyncio.Task] = []
+    first_chunks: list[tuple[dict[str, Any], list[float], Any]] = []
+    for embed_batch in batch_iterable(chunk_payloads, embed_batch_size):
+        texts = [payload["chunk_text"] for payload in embed_batch]
+        try:
+            dense_vectors, sparse_vectors = await asyncio.gather(qdrant.dense_vectors(texts), qdrant.sparse_vectors(texts))
+        except Exception as embed_error:
+            logger.error(f"Failed to embed {len(texts)} chunks: {embed_error}")
+            failed.update(payload["comment_id"] for payload in embed_batch)
+            continue
 
+        points = list(zip(embed_batch, dense_vectors, sparse_vectors, strict=True))
+        first_chunks.extend(point for point in points if point[0]["chunk_index"] == 0)
+        rest = [point for point in points if point[0]["chunk_index"] > 0]
+        upserts.extend(asyncio.create_task(upsert(batch)) for batch in batch_iterable(rest, BATCH_SIZE))
+    await asyncio.gather(*upserts)
 
-async def async_batch_iterable(
-    aiterable: AsyncGenerator[Any, None], batch_size: int = BATCH_SIZE
-) -> AsyncGenerator[list[Any], None]:
-    batch = []
-    async for item in aiterable:
-        batch.append(item)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
+    # The first chunk carries the hash that later runs compare against, so it is written only
+    # once the rest of its comment is stored
+    complete = [point for point in first_chunks if point[0]["comment_id"] not in failed]
+    await asyncio.gather(*(upsert(batch) for batch in batch_iterable(complete, BATCH_SIZE)))
+
+    stored = {comment_id: count for comment_id, count in chunk_counts.items() if comment_id not in failed}
+    if stored:
+        try:
+            await qdrant.client.delete(
+                collection_name=qdrant.collection_name,
+                points_selector=FilterSelector(filter=stale_chunks_filter(stored)),
+            )
+        except Exception as delete_error:
+            logger.error(f"Failed to delete stale chunks of {len(stored)} comments: {delete_error}")
+            return set()
+    return set(stored)
+
+
+async def fetch_comment_page(
+    async_db: AsyncDB, after_id: int, limit: int
+) -> list[tuple[int | None, datetime | None, Comment, Issue]]:
+    """One page of non-empty comments with their issue, continuing after comment `after_id`.
+
+    Each comment comes with its pending outbox entry, if any, read in the same query as its body,
+    so the entry is only marked done for the text that was actually embedded.
+    """
+    async with async_db.session_scope() as session:
+        result = await session.execute(
+            select(EmbeddingOutbox.id, EmbeddingOutbox.enqueued_at, Comment, Issue)
+            .select_from(Comment)
+            .join(Issue, Issue.id == Comment.issue_id)
+            .outerjoin(
+                EmbeddingOutbox,
+                and_(EmbeddingOutbox.comment_id == Comment.comment_id, EmbeddingOutbox.processed_at.is_(None)),
+            )
+            .where(Comment.id > after_id, Comment.body.is_not(None), Comment.body != "")
+            .order_by(Comment.id)
+            .limit(limit)
+        )
+        return [(entry_id, enqueued_at, comment, issue) for entry_id, enqueued_at, comment, issue in result]
 
 
-async def process_issue_comments(qdrant: AsyncQdrantVectorStore, issue: Issue) -> None:
-    with db.session_scope() as session:
-        comments = session.query(Comment).filter(Comment.issue_id == issue.id).order_by(Comment.created_at.asc()).all()
+async def iter_comment_pages(
+    async_db: AsyncDB, page_size: int = settings.EMBEDDING_PAGE_SIZE
+) -> AsyncGenerator[list[tuple[int | None, datetime | None, Comment, Issue]], None]:
+    """Page through every comment by primary key.
 
-        semaphore = asyncio.Semaphore(CONCURRENT_COMMENTS)
+    Each page is read in its own short session, so no connection is held while the page is
+    embedded, and memory stays bounded however many comments a single issue has.
+    """
+    after_id = 0
+    while page := await fetch_comment_page(async_db, after_id, page_size):
+        yield page
+        after_id = page[-1][2].id
 
-        async def sem_task(comment: Comment) -> bool:
-            async with semaphore:
-                return await upsert_comment_chunks(qdrant, comment, issue)
 
-        tasks = [sem_task(comment) for comment in comments if comment.body]
-        results = await asyncio.gather(*tasks)
+async def ingest_issues_to_qdrant_async(async_db: AsyncDB | None = None) -> None:
+    qdrant = create_vectorstore()
+    owns_db = async_db is None
+    async_db = async_db or AsyncDB()
+
+    total = ingested = 0
+    try:
+        manifest = await load_ingestion_manifest(qdrant)
+        logger.info(f"{len(manifest)} comments already stored in '{qdrant.collection_name}'.")
+        async for page in iter_comment_pages(async_db):
+            # Safe to re-run: comments whose stored hash matches are skipped, the rest overwritten
+            changed = [
+                (comment, issue)
+                for _, _, comment, issue in page
+                if manifest.get(comment.comment_id) != content_hash(comment.body or "")
+            ]
+            total += len(page)
+            stored = await upsert_comments_batched(qdrant, changed)
+            ingested += len(stored)
+            # Queued comments that are now up to date need no second pass from the outbox run
+            failed = {comment.comment_id for comment, _ in changed} - stored
+            await mark_outbox_processed(
+                async_db,
+                [
+                    (entry_id, enqueued_at)
+                    for entry_id, enqueued_at, comment, _ in page
+                    if entry_id is not None and enqueued_at is not None and comment.comment_id not in failed
+                ],
+            )
+            logger.info(f"Processed {total} comments so far, {ingested} ingested.")
+    finally:
+        qdrant.close()
+        if owns_db:
+            await async_db.dispose()
 
-        total_comments = len(comments)
-        total_skipped = total_comments - sum(results)
-        total_ingested = sum(results)
+    logger.info(f"Embedding ingestion finished: {total} comments total, {total - ingested} skipped, {ingested} ingested.")
 
-        logger.info(
-            f"Issue #{issue.number} from {issue.repo} processed: "
-            f"{total_comments} comments total, "
-            f"{total_skipped} skipped, "
-            f"{total_ingested} ingested."
+
+async def fetch_outbox_batch(async_db: AsyncDB, after_id: int, limit: int) -> list[tuple[int, datetime, Comment, Issue]]:
+    async with async_db.session_scope() as session:
+        result = await session.execute(
+            select(EmbeddingOutbox.id, EmbeddingOutbox.enqueued_at, Comment, Issue)
+            .join(Comment, Comment.comment_id == EmbeddingOutbox.comment_id)
+            .join(Issue, Issue.id == Comment.issue_id)
+            .where(EmbeddingOutbox.processed_at.is_(None), EmbeddingOutbox.id > after_id)
+            .order_by(EmbeddingOutbox.id)
+            .limit(limit)
         )
+        return [(entry_id, enqueued_at, comment, issue) for entry_id, enqueued_at, comment, issue in result]
+
+
+async def mark_outbox_processed(async_db: AsyncDB, entries: list[tuple[int, datetime]]) -> None:
+    """Mark outbox entries done, unless the comment was queued again while it was being embedded."""
+    if not entries:
+        return
+
+    # Core UPDATE, since the ORM only runs executemany updates keyed on the primary key alone
+    outbox = cast(Table, EmbeddingOutbox.__table__)
+    stmt = (
+        update(outbox)
+        .where(outbox.c.id == bindparam("entry_id"), outbox.c.enqueued_at == bindparam("seen_at"))
+        .values(processed_at=func.now())
+    )
+    async with async_db.session_scope() as session:
+        await session.execute(stmt, [{"entry_id": entry_id, "seen_at": seen_at} for entry_id, seen_at in entries])
 
 
-async def ingest_issues_to_qdrant_async() -> None:
-    qdrant = AsyncQdrantVectorStore()
-    with db.session_scope() as session:
-        issues = session.query(Issue).yield_per(10)
-        for issue in issues:
-            await process_issue_comments(qdrant, issue)
+async def ingest_outbox_to_qdrant_async(
+    async_db: AsyncDB | None = None, batch_size: int = settings.OUTBOX_BATCH_SIZE
+) -> int:
+    """Embed only the comments queued in the outbox since the last run and return how many were processed.
+
+    Comments whose stored hash already matches, e.g. after a bulk re-queue, are marked done
+    without being embedded again. Entries that fail stay pending and are retried by the next run.
+    """
+    qdrant = create_vectorstore()
+    owns_db = async_db is None
+    async_db = async_db or AsyncDB()
+
+    processed = failed = 0
+    after_id = 0
+    try:
+        while batch := await fetch_outbox_batch(async_db, after_id, batch_size):
+            after_id = batch[-1][0]
+            stored_hashes = await load_stored_hashes(qdrant, [comment.comment_id for _, _, comment, _ in batch])
+            changed = [
+                (comment, issue)
+                for _, _, comment, issue in batch
+                if stored_hashes.get(comment.comment_id) != content_hash(comment.body or "")
+            ]
+            failed_ids = {comment.comment_id for comment, _ in changed} - await upsert_comments_batched(qdrant, changed)
+            done = [
+                (entry_id, enqueued_at)
+                for entry_id, enqueued_at, comment, _ in batch
+                if comment.comment_id not in failed_ids
+            ]
+            await mark_outbox_processed(async_db, done)
+            processed += len(done)
+            failed += len(batch) - len(done)
+    finally:
+        qdrant.close()
+        if owns_db:
+            await async_db.dispose()
+
+    logger.info(f"Embedding outbox: {processed} comments processed, {failed} left pending.")
+    return processed
 
 
 if __name__ == "__main__":
-    asyncio.run(ingest_issues_to_qdrant_async())
+    parser = argparse.ArgumentParser(description="Embed GitHub issue comments into Qdrant")
+    parser.add_argument("--outbox", action="store_true", help="Only embed comments queued since the last run")
+    args = parser.parse_args()
+
+    asyncio.run(ingest_outbox_to_qdrant_async() if args.outbox else ingest_issues_to_qdrant_async())
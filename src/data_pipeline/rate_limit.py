@@ -0,0 +1,210 @@
+import fcntl
+import hashlib
+import json
+import random
+import time
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import TypeVar
+
+from loguru import logger
+from pydantic import BaseModel
+from sqlalchemy.dialects.postgresql import insert
+
+from src.database.session import DB
+from src.models.db_models import RateLimitState
+from src.utils.config import settings
+
+T = TypeVar("T")
+
+# GitHub's primary rate limits reset every hour
+RATE_LIMIT_WINDOW = 3600
+# The window's request rate is measured over at least this many seconds, so its first few requests
+# are not mistaken for a rate that would drain the budget
+MIN_RATE_SAMPLE = 60.0
+# Budget a request is charged to unless `X-RateLimit-Resource` names another, e.g. "graphql"
+DEFAULT_RESOURCE = "core"
+
+
+class RateLimitBudget(BaseModel):
+    remaining: int | None = None
+    used: int | None = None
+    reset_at: float = 0
+    next_slot: float = 0
+    backoff_until: float = 0
+
+
+class FileRateLimitStore:
+    """Budgets shared by every collector process on the host, serialized with an exclusive `flock`."""
+
+    def __init__(self, path: str = settings.GH_RATE_LIMIT_STATE_PATH) -> None:
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(self.path.suffix + ".lock")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def transact(self, key: str, mutate: Callable[[RateLimitBudget], T]) -> T:
+        with self.lock_path.open("a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    data = json.loads(self.path.read_text()) if self.path.exists() else {}
+                except json.JSONDecodeError:
+                    data = {}
+                budget = RateLimitBudget(**data.get(key, {}))
+                result = mutate(budget)
+                data[key] = budget.model_dump()
+                self.path.write_text(json.dumps(data))
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class PostgresRateLimitStore:
+    """Budgets shared by collector pods through a row lock on `github_rate_limits`."""
+
+    def __init__(self, db: DB) -> None:
+        self.db = db
+
+    def transact(self, key: str, mutate: Callable[[RateLimitBudget], T]) -> T:
+        with self.db.session_scope() as session:
+            session.execute(insert(RateLimitState).values(key=key).on_conflict_do_nothing(index_elements=["key"]))
+            row = session.query(RateLimitState).filter_by(key=key).with_for_update().one()
+            budget = RateLimitBudget(
+                remaining=row.remaining,
+                used=row.used,
+                reset_at=row.reset_at,
+                next_slot=row.next_slot,
+                backoff_until=row.backoff_until,
+            )
+            result = mutate(budget)
+            row.remaining = budget.remaining
+            row.used = budget.used
+            row.reset_at = budget.reset_at
+            row.next_slot = budget.next_slot
+            row.backoff_until = budget.backoff_until
+            return result
+
+
+class RateLimitGovernor:
+    """Pace GitHub requests across workers so each token's budget lasts until its reset time.
+
+    Requests run back to back while the window's rate so far would leave budget at the reset.
+    Once it would not, every request reserves a time slot that spreads the remaining budget
+    (minus a safety margin) evenly over the time left. A 403/429 rate-limit answer pushes the
+    shared `backoff_until` forward (honoring `Retry-After`) so all workers pause, not just the
+    one hit.
+    """
+
+    def __init__(
+        self,
+        store: FileRateLimitStore | PostgresRateLimitStore,
+        margin: int = settings.GH_RATE_LIMIT_MARGIN,
+        backoff_base: float = settings.GH_BACKOFF_BASE,
+        backoff_max: float = settings.GH_BACKOFF_MAX,
+    ) -> None:
+        self.store = store
+        self.margin = margin
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_settings(cls, db: DB) -> "RateLimitGovernor":
+        if settings.GH_RATE_LIMIT_STORE == "postgres":
+            return cls(PostgresRateLimitStore(db))
+        return cls(FileRateLimitStore())
+
+    @staticmethod
+    def key_for(token: str | None, resource: str = DEFAULT_RESOURCE) -> str:
+        # Never persist the token itself; every resource of a token has its own budget and reset time
+        token_key = hashlib.sha256(token.encode()).hexdigest()[:16] if token else "anonymous"
+        return f"{token_key}:{resource}"
+
+    @staticmethod
+    def resource_for(url: str, headers: Mapping[str, str] | None = None) -> str:
+        """The rate-limit resource a request is charged to, as named by its response when there is one."""
+        if headers and "X-RateLimit-Resource" in headers:
+            return headers["X-RateLimit-Resource"]
+        return "graphql" if url.rstrip("/").endswith("/graphql") else DEFAULT_RESOURCE
+
+    def reserve(self, key: str) -> float:
+        """Claim the next request slot for `key` and return how many seconds to wait for it."""
+
+        def mutate(budget: RateLimitBudget) -> float:
+            now = time.time()
+            if budget.reset_at and budget.reset_at <= now:
+                budget.remaining, budget.reset_at = None, 0
+
+            slot = max(now, budget.next_slot, budget.backoff_until)
+            interval = 0.0
+            if budget.remaining is not None and budget.reset_at:
+                usable = budget.remaining - self.margin
+                if usable <= 0:
+                    slot = max(slot, budget.reset_at)
+                elif self.would_exhaust(budget, now, usable):
+                    interval = (budget.reset_at - now) / usable
+                budget.remaining -= 1
+                if budget.used is not None:
+                    budget.used += 1
+
+            budget.next_slot = slot + interval
+            return slot - now
+
+        return self.store.transact(key, mutate)
+
+    @staticmethod
+    def would_exhaust(budget: RateLimitBudget, now: float, usable: int) -> bool:
+        """Whether requests at the window's rate so far would use up `usable` before the reset."""
+        if budget.used is None:
+            # Without X-RateLimit-Used the rate is unknown, so spread the budget evenly
+            return True
+        elapsed = max(now - (budget.reset_at - RATE_LIMIT_WINDOW), MIN_RATE_SAMPLE)
+        return budget.used / elapsed * (budget.reset_at - now) > usable
+
+    def record(self, key: str, headers: Mapping[str, str]) -> None:
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        remaining = int(headers["X-RateLimit-Remaining"])
+        used = int(headers["X-RateLimit-Used"]) if "X-RateLimit-Used" in headers else None
+        reset_at = float(headers.get("X-RateLimit-Reset", 0))
+
+        def mutate(budget: RateLimitBudget) -> None:
+            if budget.reset_at == reset_at and budget.remaining is not None:
+                # Responses from other workers can arrive out of order within the same window
+                budget.remaining = min(budget.remaining, remaining)
+                if used is not None:
+                    budget.used = max(budget.used or 0, used)
+            else:
+                budget.remaining, budget.used, budget.reset_at = remaining, used, reset_at
+
+        self.store.transact(key, mutate)
+
+    @staticmethod
+    def is_rate_limited(status_code: int, headers: Mapping[str, str], body: str = "") -> bool:
+        if status_code == 429:
+            return True
+        if status_code != 403:
+            return False
+        return (
+            "Retry-After" in headers
+            or headers.get("X-RateLimit-Remaining") == "0"
+            or "rate limit" in body.lower()
+            or "abuse" in body.lower()
+        )
+
+    def backoff(self, key: str, headers: Mapping[str, str], attempt: int) -> float:
+        now = time.time()
+        if "Retry-After" in headers:
+            delay = float(headers["Retry-After"])
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = float(headers.get("X-RateLimit-Reset", now)) - now + 1
+        else:
+            delay = min(self.backoff_base * 2**attempt, self.backoff_max)
+            delay += random.uniform(0, delay / 4)
+        delay = max(delay, 0)
+
+        def mutate(budget: RateLimitBudget) -> None:
+            budget.backoff_until = max(budget.backoff_until, now + delay)
+
+        self.store.transact(key, mutate)
+        logger.warning(f"GitHub rate limit hit, backing off for {delay:.1f} seconds (attempt {attempt + 1}).")
+        return delay
@@ -0,0 +1,87 @@
+import fcntl
+import gzip
+import json
+from collections.abc import Generator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from src.utils.config import settings
+
+PayloadKind = Literal["issues", "comments"]
+
+
+class RawPayloadArchive:
+    """Append-only archive of the raw GitHub JSON the collectors download.
+
+    Records land in `{root}/{owner}/{repo}/date=YYYY-MM-DD/{kind}.jsonl.gz`. Each `write()` appends
+    one gzip member under an exclusive `flock`, so several collector processes can share an archive,
+    and the concatenated members read back as a single stream.
+    """
+
+    def __init__(self, root: str = settings.GH_RAW_ARCHIVE_PATH) -> None:
+        self.root = Path(root)
+
+    def partition(self, owner: str, repo: str, day: str) -> Path:
+        return self.root / owner / repo / f"date={day}"
+
+    def write(
+        self, owner: str, repo: str, kind: PayloadKind, payloads: list[dict[str, Any]], issue_number: int | None = None
+    ) -> None:
+        if not payloads:
+            return
+        now = datetime.now(UTC)
+        fetched_at = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        records = []
+        for payload in payloads:
+            record: dict[str, Any] = {"fetched_at": fetched_at, "payload": payload}
+            if kind == "comments":
+                record["issue_number"] = issue_number or self.issue_number_from_url(payload.get("issue_url"))
+            records.append(json.dumps(record))
+
+        directory = self.partition(owner, repo, now.strftime("%Y-%m-%d"))
+        directory.mkdir(parents=True, exist_ok=True)
+        with (directory / f"{kind}.jsonl.gz").open("ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(gzip.compress(("\n".join(records) + "\n").encode()))
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def issue_number_from_url(issue_url: str | None) -> int | None:
+        return int(issue_url.rsplit("/", 1)[-1]) if issue_url else None
+
+    def repositories(self) -> list[tuple[str, str]]:
+        return sorted((path.parent.name, path.name) for path in self.root.glob("*/*") if path.is_dir())
+
+    def iter_records(self, owner: str, repo: str, kind: PayloadKind) -> Generator[dict[str, Any], None, None]:
+        """Yield archived records of one repository, oldest partition first."""
+        for path in sorted((self.root / owner / repo).glob(f"date=*/{kind}.jsonl.gz")):
+            with gzip.open(path, "rt") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def latest_issues(self, owner: str, repo: str) -> dict[int, dict[str, Any]]:
+        """Newest archived payload of every issue, by `updated_at` and then archive order."""
+        latest: dict[int, dict[str, Any]] = {}
+        for record in self.iter_records(owner, repo, "issues"):
+            payload = record["payload"]
+            current = latest.get(payload["number"])
+            if current is None or (payload.get("updated_at") or "") >= (current.get("updated_at") or ""):
+                latest[payload["number"]] = payload
+        return latest
+
+    def latest_comments(self, owner: str, repo: str) -> dict[int, dict[int, dict[str, Any]]]:
+        """Newest archived payload of every comment, grouped as `{issue_number: {comment_id: payload}}`."""
+        latest: dict[int, dict[int, dict[str, Any]]] = {}
+        for record in self.iter_records(owner, repo, "comments"):
+            if record.get("issue_number") is None:
+                continue
+            payload = record["payload"]
+            comments = latest.setdefault(record["issue_number"], {})
+            current = comments.get(payload["id"])
+            if current is None or (payload.get("updated_at") or "") >= (current.get("updated_at") or ""):
+                comments[payload["id"]] = payload
+        return latest
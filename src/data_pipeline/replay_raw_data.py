@@ -0,0 +1,61 @@
+import argparse
+from itertools import batched
+
+from loguru import logger
+
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.data_pipeline.raw_archive import RawPayloadArchive
+from src.database.session import DB
+from src.database.upserts import UPSERT_CHUNK_SIZE
+from src.models.github_models import AnyGitHubComment
+
+
+def replay_repository(
+    collector: GitHubIssuesCollector,
+    archive: RawPayloadArchive,
+    owner: str,
+    repo: str,
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> int:
+    """Rebuild the issues and comments of one repository from the archive, without network calls.
+
+    Only the newest archived version of each issue and comment is written. Returns the number
+    of issues replayed.
+    """
+    raw_issues = archive.latest_issues(owner, repo)
+    raw_comments = archive.latest_comments(owner, repo)
+    issues = collector.parse_issues(list(raw_issues.values()))
+    logger.info(f"Replaying {len(issues)} archived issues for {owner}/{repo}...")
+
+    replayed = 0
+    for chunk in batched(issues, chunk_size):
+        # Always pass the grouped comments, so saving never falls back to fetching them from GitHub
+        comments_by_issue: dict[int, list[AnyGitHubComment]] = {
+            issue.number: collector.parse_comments(list(raw_comments.get(issue.number, {}).values())) for issue in chunk
+        }
+        if not collector.save_issues_to_db(list(chunk), owner, repo, comments_by_issue):
+            logger.warning(f"Replay of {owner}/{repo} stopped after {replayed} issues.")
+            break
+        replayed += len(chunk)
+    return replayed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the issues and comments tables from the raw payload archive")
+    parser.add_argument("--archive-path", help="Archive root (defaults to GH_RAW_ARCHIVE_PATH)")
+    parser.add_argument("--repo", action="append", help="Only replay this owner/repo (repeatable)")
+    parser.add_argument("--bulk-upserts", action="store_true", help="Write with set-based upserts")
+    parser.add_argument("--copy-load", action="store_true", help="Write through COPY into staging tables")
+    args = parser.parse_args()
+
+    raw_archive = RawPayloadArchive(args.archive_path) if args.archive_path else RawPayloadArchive()
+    targets = [tuple(name.split("/", 1)) for name in args.repo] if args.repo else raw_archive.repositories()
+
+    db = DB()
+    replay_collector = GitHubIssuesCollector(db=db, bulk_upserts=args.bulk_upserts, copy_load=args.copy_load)
+    # Parsing rules may have changed since the rows were written, so rewrite unchanged rows too
+    replay_collector.force_rewrite = True
+
+    for target_owner, target_repo in targets:
+        count = replay_repository(replay_collector, raw_archive, target_owner, target_repo)
+        logger.info(f"Replayed {count} issues for {target_owner}/{target_repo}.")
@@ -0,0 +1,74 @@
+import threading
+import time
+from collections.abc import Mapping
+
+from pydantic import BaseModel
+
+from src.data_pipeline.rate_limit import DEFAULT_RESOURCE
+from src.utils.config import settings
+
+# GitHub's hourly quota for an authenticated token, REST requests or GraphQL points, assumed until the
+# first response says otherwise
+DEFAULT_QUOTA = 5000
+
+
+class TokenQuota(BaseModel):
+    remaining: int = DEFAULT_QUOTA
+    reset_at: float = 0
+
+
+class GitHubTokenPool:
+    """Thread-safe pool of GitHub tokens that hands out the one with the most remaining quota.
+
+    Quotas are refreshed from the `X-RateLimit-*` headers of every response, and a request is
+    counted against its token as soon as the token is handed out, so concurrent workers spread
+    across tokens instead of piling onto the same one. Each rate-limit resource (REST "core",
+    "graphql", ...) is tracked separately, as GitHub budgets them separately.
+    """
+
+    def __init__(self, tokens: list[str]) -> None:
+        if not tokens:
+            raise ValueError("GitHubTokenPool needs at least one token.")
+        self.lock = threading.Lock()
+        self.tokens = list(dict.fromkeys(tokens))
+        self.quotas: dict[str, dict[str, TokenQuota]] = {}
+
+    @classmethod
+    def from_settings(cls) -> "GitHubTokenPool | None":
+        tokens = [token.strip() for token in settings.GH_TOKENS.split(",") if token.strip()]
+        if not tokens and settings.GH_TOKEN:
+            tokens = [settings.GH_TOKEN]
+        return cls(tokens) if tokens else None
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def resource_quotas(self, resource: str) -> dict[str, TokenQuota]:
+        """Quotas of every token for `resource`; callers hold the lock."""
+        if resource not in self.quotas:
+            self.quotas[resource] = {token: TokenQuota() for token in self.tokens}
+        return self.quotas[resource]
+
+    def acquire(self, resource: str = DEFAULT_RESOURCE) -> str:
+        with self.lock:
+            quotas = self.resource_quotas(resource)
+            now = time.time()
+            for quota in quotas.values():
+                if quota.reset_at and quota.reset_at <= now:
+                    quota.remaining, quota.reset_at = DEFAULT_QUOTA, 0
+
+            token = max(quotas, key=lambda t: quotas[t].remaining)
+            quotas[token].remaining -= 1
+            return token
+
+    def update(self, token: str, headers: Mapping[str, str]) -> None:
+        if "X-RateLimit-Remaining" not in headers:
+            return
+        with self.lock:
+            quota = self.resource_quotas(headers.get("X-RateLimit-Resource", DEFAULT_RESOURCE))[token]
+            quota.remaining = int(headers["X-RateLimit-Remaining"])
+            quota.reset_at = float(headers.get("X-RateLimit-Reset", 0))
+
+    def remaining(self, resource: str = DEFAULT_RESOURCE) -> int:
+        with self.lock:
+            return sum(max(quota.remaining, 0) for quota in self.resource_quotas(resource).values())
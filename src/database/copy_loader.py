@@ -0,0 +1,151 @@
+import io
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from src.database.upserts import enqueue_embeddings, on_comment_conflict, on_issue_conflict
+from src.models.db_models import Comment, Issue
+
+ISSUES_STAGING = "issues_staging"
+COMMENTS_STAGING = "comments_staging"
+ISSUE_COPY_COLUMNS = [
+    "owner",
+    "repo",
+    "number",
+    "title",
+    "body",
+    "state",
+    "author",
+    "url",
+    "created_at",
+    "updated_at",
+    "is_bug",
+    "is_feature",
+]
+# Comments are staged with their issue's natural key; the merge resolves `issue_id` with a join
+COMMENT_COPY_COLUMNS = ["comment_id", "owner", "repo", "issue_number", "author", "body", "created_at", "updated_at"]
+COMMENT_MERGE_COLUMNS = ["comment_id", "issue_id", "author", "body", "created_at", "updated_at"]
+
+# Session-local staging tables, created on first use per connection and emptied by every commit
+ISSUES_STAGING_DDL = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {ISSUES_STAGING} ON COMMIT DELETE ROWS AS "
+    f"SELECT {', '.join(ISSUE_COPY_COLUMNS)} FROM {Issue.__tablename__} WITH NO DATA"
+)
+COMMENTS_STAGING_DDL = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {COMMENTS_STAGING} ON COMMIT DELETE ROWS AS "
+    f"SELECT c.comment_id, i.owner, i.repo, i.number AS issue_number, c.author, c.body, c.created_at, c.updated_at "
+    f"FROM {Comment.__tablename__} c JOIN {Issue.__tablename__} i ON c.issue_id = i.id WITH NO DATA"
+)
+
+
+def copy_text(value: Any) -> str:
+    """Encode one value for `COPY ... FROM STDIN` in the default text format."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class CopyStream(io.TextIOBase):
+    """File-like view over COPY lines, so rows are encoded as the driver reads them instead of up front."""
+
+    def __init__(self, rows: Iterable[dict[str, Any]], columns: list[str]) -> None:
+        self.lines: Iterator[str] = ("\t".join(copy_text(row[c]) for c in columns) + "\n" for row in rows)
+        self.pending = ""
+        self.row_count = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> str:
+        while size is None or size < 0 or len(self.pending) < size:
+            try:
+                self.pending += next(self.lines)
+            except StopIteration:
+                break
+            self.row_count += 1
+        if size is None or size < 0:
+            chunk, self.pending = self.pending, ""
+        else:
+            chunk, self.pending = self.pending[:size], self.pending[size:]
+        return chunk
+
+
+def copy_into_staging(session: Session, ddl: str, staging: str, columns: list[str], rows: Iterable[dict[str, Any]]) -> int:
+    """Stream `rows` into a freshly truncated staging table with COPY and return how many were loaded."""
+    session.execute(text(ddl))
+    session.execute(text(f"TRUNCATE {staging}"))
+
+    stream = CopyStream(rows, columns)
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {staging} ({', '.join(columns)}) FROM STDIN", stream)
+    finally:
+        cursor.close()
+    return stream.row_count
+
+
+def copy_issues(session: Session, rows: Iterable[dict[str, Any]], force: bool = False) -> dict[int, int]:
+    """COPY issue rows of one repository into staging and merge them into `issues` with one statement.
+
+    Returns `{number: id}` of the issues actually written; as with `upsert_issues`, rows whose
+    `updated_at` is unchanged are skipped unless `force` is set.
+    """
+    if not copy_into_staging(session, ISSUES_STAGING_DDL, ISSUES_STAGING, ISSUE_COPY_COLUMNS, rows):
+        return {}
+
+    staging = table(ISSUES_STAGING, *(column(name) for name in ISSUE_COPY_COLUMNS))
+    # One row per issue, so the merge never touches the same target row twice
+    latest = (
+        select(*(staging.c[name] for name in ISSUE_COPY_COLUMNS))
+        .distinct(staging.c.owner, staging.c.repo, staging.c.number)
+        .order_by(staging.c.owner, staging.c.repo, staging.c.number, staging.c.updated_at.desc().nulls_last())
+    )
+    stmt = on_issue_conflict(insert(Issue).from_select(ISSUE_COPY_COLUMNS, latest), force).returning(Issue.number, Issue.id)
+    return {number: issue_id for number, issue_id in session.execute(stmt)}
+
+
+def copy_comments(session: Session, rows: Iterable[dict[str, Any]], force: bool = False) -> int:
+    """COPY comment rows into staging, merge them into `comments` and queue the written ones for embedding.
+
+    Returns how many rows were written. Comments whose issue is not stored (e.g. pull request
+    comments) are dropped by the join.
+    """
+    if not copy_into_staging(session, COMMENTS_STAGING_DDL, COMMENTS_STAGING, COMMENT_COPY_COLUMNS, rows):
+        return 0
+
+    staging = table(COMMENTS_STAGING, *(column(name) for name in COMMENT_COPY_COLUMNS))
+    latest = (
+        select(
+            staging.c.comment_id,
+            Issue.id,
+            staging.c.author,
+            staging.c.body,
+            staging.c.created_at,
+            staging.c.updated_at,
+        )
+        .select_from(staging)
+        .join(
+            Issue,
+            and_(
+                Issue.owner == staging.c.owner,
+                Issue.repo == staging.c.repo,
+                Issue.number == staging.c.issue_number,
+            ),
+        )
+        .distinct(staging.c.comment_id)
+        .order_by(staging.c.comment_id, staging.c.updated_at.desc().nulls_last())
+    )
+    stmt = on_comment_conflict(insert(Comment).from_select(COMMENT_MERGE_COLUMNS, latest), force).returning(
+        Comment.comment_id
+    )
+    written = list(session.execute(stmt).scalars())
+    enqueue_embeddings(session, written)
+    return len(written)
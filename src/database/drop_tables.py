@@ -6,9 +6,6 @@ from src.database.session import db
 
 
 def drop_all_tables() -> None:
-    if db.engine is None:
-        raise RuntimeError("Database engine is not initialized.")
-
     inspector = inspect(db.engine)
     existing_tables = inspector.get_table_names()
 
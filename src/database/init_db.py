@@ -6,16 +6,15 @@ from src.models.db_models import Base
 
 
 def init_db() -> None:
-    if db.engine is None:
-        raise RuntimeError("Database engine is not initialized.")
-
     inspector = inspect(db.engine)
     existing_tables = inspector.get_table_names()
 
-    if "issues" in existing_tables and "comments" in existing_tables:
+    missing_tables = [name for name in Base.metadata.tables if name not in existing_tables]
+
+    if not missing_tables:
         logger.info("Tables already exist. Skipping creation.")
     else:
-        logger.info("Creating tables in the database...")
+        logger.info(f"Creating tables in the database: {missing_tables}...")
         Base.metadata.create_all(bind=db.engine)
         logger.success("Tables created successfully!")
 
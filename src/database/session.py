@@ -1,64 +1,142 @@
 import json
 import os
-from collections.abc import Generator
-from contextlib import contextmanager
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any
 
 import boto3
 from loguru import logger
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Dialect, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from src.models.db_models import DBConfig
 from src.utils.config import settings
 
+# invalid_password, invalid_authorization_specification
+AUTH_FAILURE_CODES = {"28P01", "28000"}
 
-def get_db_credentials_from_aws(secret_name: str, region_name: str) -> dict:
-    client = boto3.client("secretsmanager", region_name=region_name)
-    response = client.get_secret_value(SecretId=secret_name)
-    print(f"Response from AWS: {response}")
-    return json.loads(response["SecretString"])
+_secret_cache: dict[tuple[str, str], tuple[float, dict]] = {}
+_secret_lock = threading.Lock()
+
+
+def get_db_credentials_from_aws(secret_name: str, region_name: str, force_refresh: bool = False) -> dict:
+    """Fetch the database secret, reusing it for `DB_SECRET_TTL` seconds unless `force_refresh` is set."""
+    key = (secret_name, region_name)
+    with _secret_lock:
+        cached = _secret_cache.get(key)
+        if cached and not force_refresh and time.monotonic() - cached[0] < settings.DB_SECRET_TTL:
+            return cached[1]
+
+        client = boto3.client("secretsmanager", region_name=region_name)
+        response = client.get_secret_value(SecretId=secret_name)
+        logger.info(f"Fetched database secret '{secret_name}' from AWS Secrets Manager")
+        creds = json.loads(response["SecretString"])
+        _secret_cache[key] = (time.monotonic(), creds)
+        return creds
+
+
+def uses_aws_secret(config: DBConfig | None = None) -> bool:
+    return config is None and os.getenv("APP_ENV", "dev").lower() == "prod"
+
+
+def resolve_db_config(config: DBConfig | None = None) -> DBConfig:
+    if config is not None:
+        return config
+
+    if uses_aws_secret():
+        creds = get_db_credentials_from_aws(settings.SECRET_NAME, settings.AWS_REGION)
+        return DBConfig(
+            username=creds["username"],
+            password=creds["password"],
+            host=creds["host"],
+            port=int(creds["port"]),
+            dbname=creds["dbname"],
+        )
+    return DBConfig(
+        username=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=int(settings.POSTGRES_PORT),
+        dbname=settings.POSTGRES_DB,
+    )
+
+
+def is_auth_failure(error: Exception) -> bool:
+    code = getattr(error, "pgcode", None) or getattr(error, "sqlstate", None)
+    return code in AUTH_FAILURE_CODES or "password authentication failed" in str(error)
+
+
+def refresh_credentials_on_auth_failure(engine: Engine) -> None:
+    """Connect with the cached AWS secret, and fetch it again once if Postgres rejects it.
+
+    New pool connections pick up a rotated password without rebuilding the engine.
+    """
+
+    @event.listens_for(engine, "do_connect")
+    def connect(dialect: Dialect, conn_rec: Any, cargs: tuple, cparams: dict) -> Any:
+        creds = get_db_credentials_from_aws(settings.SECRET_NAME, settings.AWS_REGION)
+        cparams.update(user=creds["username"], password=creds["password"])
+        try:
+            return dialect.connect(*cargs, **cparams)
+        except Exception as e:
+            if not is_auth_failure(e):
+                raise
+            logger.warning("Database rejected the cached credentials, fetching the secret again")
+            creds = get_db_credentials_from_aws(settings.SECRET_NAME, settings.AWS_REGION, force_refresh=True)
+            cparams.update(user=creds["username"], password=creds["password"])
+            return dialect.connect(*cargs, **cparams)
+
+
+def pool_options() -> dict:
+    return {
+        "echo": settings.DB_ECHO,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
 
 
 class DB:
+    """Synchronous database handle; the engine is only created, and credentials fetched, on first use."""
+
     def __init__(self, config: DBConfig | None = None) -> None:
-        self.engine: Engine | None = None
-        self.SessionLocal: sessionmaker | None = None
-        self._init_db(config)
-
-    def _init_db(self, config: DBConfig | None) -> None:
-        if config is None:
-            app_env = os.getenv("APP_ENV", "dev").lower()
-            if app_env == "prod":
-                creds = get_db_credentials_from_aws(settings.SECRET_NAME, settings.AWS_REGION)
-                config = DBConfig(
-                    username=creds["username"],
-                    password=creds["password"],
-                    host=creds["host"],
-                    port=int(creds["port"]),
-                    dbname=creds["dbname"],
-                )
-            else:
-                config = DBConfig(
-                    username=settings.POSTGRES_USER,
-                    password=settings.POSTGRES_PASSWORD,
-                    host=settings.POSTGRES_HOST,
-                    port=int(settings.POSTGRES_PORT),
-                    dbname=settings.POSTGRES_DB,
-                )
-
-        logger.info(f"Connecting to DB with: {config}")
-        db_url = config.build_url()
-        logger.info(f"Database URL: {db_url}")
-        self.engine = create_engine(db_url, echo=True)
+        self.config = config
+        self._engine: Engine | None = None
+        self._session_factory: sessionmaker | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._init_db()
+        assert self._engine is not None
+        return self._engine
+
+    @property
+    def SessionLocal(self) -> sessionmaker:
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(bind=self.engine)
+        return self._session_factory
+
+    def _init_db(self) -> None:
+        config = resolve_db_config(self.config)
+
+        logger.info(f"Connecting to DB with: {config.model_dump(exclude={'password'})}")
+        engine = create_engine(config.build_url(), **pool_options())
+        if uses_aws_secret(self.config):
+            refresh_credentials_on_auth_failure(engine)
+        self._engine = engine
         logger.info("DB engine created")
-        self.SessionLocal = sessionmaker(bind=self.engine)
-        logger.info("DB sessionmaker created")
 
     def get_session(self) -> Session:
         """Create and return a new Session instance."""
-        if self.SessionLocal is None:
-            raise RuntimeError("SessionLocal is not initialized.")
         return self.SessionLocal()
 
     @contextmanager
@@ -75,5 +153,59 @@ class DB:
             session.close()
 
 
-# usage example
+class AsyncDB:
+    """asyncpg-backed counterpart of `DB` for code running on an event loop.
+
+    Uses the same connection settings and pool options as `DB` and is just as lazy; asyncpg
+    caches up to `DB_STATEMENT_CACHE_SIZE` prepared statements per connection (set 0 behind pgbouncer).
+    """
+
+    def __init__(self, config: DBConfig | None = None) -> None:
+        self.config = config
+        self._engine: AsyncEngine | None = None
+        self._session_factory: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        # No lock needed: creating the engine never awaits, so nothing can interleave on the loop
+        if self._engine is None:
+            config = resolve_db_config(self.config).model_copy(update={"driver": "postgresql+asyncpg"})
+            logger.info(f"Connecting to DB (async) with: {config.model_dump(exclude={'password'})}")
+            engine = create_async_engine(
+                config.build_url(),
+                connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+                **pool_options(),
+            )
+            if uses_aws_secret(self.config):
+                refresh_credentials_on_auth_failure(engine.sync_engine)
+            self._engine = engine
+            logger.info("Async DB engine created")
+        return self._engine
+
+    @property
+    def SessionLocal(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_factory is None:
+            # Objects stay readable after commit, so results can be used once the session is closed
+            self._session_factory = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        return self._session_factory
+
+    @asynccontextmanager
+    async def session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        """Provide a transactional scope around a series of async operations."""
+        session = self.SessionLocal()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+
+
+# Shared handle for scripts; creating it is free, the engine is built on first use
 db = DB()
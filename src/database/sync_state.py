@@ -0,0 +1,58 @@
+from datetime import UTC, datetime
+
+from sqlalchemy.orm import Session
+
+from src.models.db_models import SyncCheckpoint, SyncState
+
+
+def get_sync_state(session: Session, owner: str, repo: str) -> SyncState | None:
+    return session.query(SyncState).filter_by(owner=owner, repo=repo).first()
+
+
+def get_or_create_sync_state(session: Session, owner: str, repo: str) -> SyncState:
+    state = get_sync_state(session, owner, repo)
+    if state is None:
+        state = SyncState(owner=owner, repo=repo)
+        session.add(state)
+    return state
+
+
+def get_watermark(session: Session, owner: str, repo: str) -> datetime | None:
+    """Return the `updated_at` of the newest issue seen by the last successful sync, if any."""
+    state = get_sync_state(session, owner, repo)
+    return state.last_updated_at if state else None
+
+
+def update_watermark(session: Session, owner: str, repo: str, watermark: datetime) -> None:
+    state = get_or_create_sync_state(session, owner, repo)
+    state.last_updated_at = watermark
+    state.last_synced_at = datetime.now(UTC).replace(tzinfo=None, microsecond=0)
+    # The run finished, so there is nothing left to resume
+    state.checkpoint_page = None
+    state.checkpoint_cursor = None
+    state.checkpoint_since = None
+    state.checkpoint_started_at = None
+    state.checkpoint_mode = None
+
+
+def get_checkpoint(session: Session, owner: str, repo: str) -> SyncCheckpoint | None:
+    """Return where an interrupted run stopped, if it committed at least one page."""
+    state = get_sync_state(session, owner, repo)
+    if state is None or state.checkpoint_started_at is None:
+        return None
+    return SyncCheckpoint(
+        page=state.checkpoint_page,
+        cursor=state.checkpoint_cursor,
+        since=state.checkpoint_since,
+        started_at=state.checkpoint_started_at,
+        mode=state.checkpoint_mode,
+    )
+
+
+def save_checkpoint(session: Session, owner: str, repo: str, checkpoint: SyncCheckpoint) -> None:
+    state = get_or_create_sync_state(session, owner, repo)
+    state.checkpoint_page = checkpoint.page
+    state.checkpoint_cursor = checkpoint.cursor
+    state.checkpoint_since = checkpoint.since
+    state.checkpoint_started_at = checkpoint.started_at
+    state.checkpoint_mode = checkpoint.mode
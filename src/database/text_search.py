@@ -0,0 +1,76 @@
+from typing import Any
+
+from sqlalchemy import BigInteger, ColumnElement, Select, Text, cast, func, null, select, union_all
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSQUERY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.db_models import Comment, Issue
+from src.utils.config import settings
+
+SEARCH_CONFIG = "english"
+# An issue title and body make a long query; longer text only adds rarely useful terms
+MAX_QUERY_CHARS = 2000
+
+
+def any_terms_query(query_text: str) -> ColumnElement[Any]:
+    """tsquery matching documents that contain any of the query's terms.
+
+    `plainto_tsquery` ANDs every word, which almost never matches a whole issue body, so its
+    `&` operators are swapped for `|` and `ts_rank_cd` decides which documents match best.
+    """
+    all_terms = func.plainto_tsquery(cast(SEARCH_CONFIG, REGCONFIG), query_text[:MAX_QUERY_CHARS])
+    return cast(func.replace(cast(all_terms, Text), "&", "|"), TSQUERY)
+
+
+def lexical_search_statement(query_text: str, limit: int = 5) -> Select:
+    """Best full-text matches among comments and issues, with the columns of a `similar_issues` entry."""
+    # Wrapped in a scalar subquery so Postgres builds the tsquery once, not once per ranked row
+    query = select(any_terms_query(query_text)).scalar_subquery()
+    comment_score = func.ts_rank_cd(Comment.search_vector, query)
+    issue_score = func.ts_rank_cd(Issue.search_vector, query)
+
+    comment_hits = (
+        select(
+            Issue.number.label("issue_number"),
+            Issue.repo,
+            Issue.owner,
+            Issue.title,
+            Issue.url,
+            Comment.comment_id,
+            func.left(Comment.body, settings.CHUNK_SIZE).label("chunk_text"),
+            comment_score.label("score"),
+            Issue.is_bug,
+            Issue.is_feature,
+        )
+        .join(Issue, Issue.id == Comment.issue_id)
+        .where(Comment.search_vector.op("@@")(query))
+        .order_by(comment_score.desc())
+        .limit(limit)
+    )
+    # Issues match on their own title and body too, e.g. before any comment was written
+    issue_hits = (
+        select(
+            Issue.number.label("issue_number"),
+            Issue.repo,
+            Issue.owner,
+            Issue.title,
+            Issue.url,
+            cast(null(), BigInteger).label("comment_id"),
+            func.left(Issue.body, settings.CHUNK_SIZE).label("chunk_text"),
+            issue_score.label("score"),
+            Issue.is_bug,
+            Issue.is_feature,
+        )
+        .where(Issue.search_vector.op("@@")(query))
+        .order_by(issue_score.desc())
+        .limit(limit)
+    )
+
+    hits = union_all(comment_hits, issue_hits).subquery()
+    return select(hits).order_by(hits.c.score.desc()).limit(limit)
+
+
+async def search_issues_lexical(session: AsyncSession, query_text: str, limit: int = 5) -> list[dict[str, Any]]:
+    """Postgres full-text counterpart of the Qdrant search, returning `similar_issues` entries."""
+    result = await session.execute(lexical_search_statement(query_text, limit))
+    return [dict(row._mapping) for row in result]
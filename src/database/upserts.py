@@ -0,0 +1,114 @@
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import Insert, insert
+from sqlalchemy.orm import Session
+
+from src.models.db_models import Comment, EmbeddingOutbox, Issue
+
+ISSUE_UPDATE_COLUMNS = ["owner", "repo", "title", "body", "state", "author", "url", "is_bug", "is_feature"]
+COMMENT_UPDATE_COLUMNS = ["author", "body"]
+UPSERT_CHUNK_SIZE = 500
+
+
+def fetch_issue_versions(session: Session, owner: str, repo: str, numbers: Iterable[int]) -> dict[int, datetime | None]:
+    """Return the stored `updated_at` of every issue in `numbers` with one IN query."""
+    rows = session.execute(
+        select(Issue.number, Issue.updated_at).where(
+            Issue.owner == owner, Issue.repo == repo, Issue.number.in_(list(numbers))
+        )
+    )
+    return {number: updated_at for number, updated_at in rows}
+
+
+def fetch_comment_versions(session: Session, comment_ids: Iterable[int]) -> dict[int, datetime | None]:
+    rows = session.execute(select(Comment.comment_id, Comment.updated_at).where(Comment.comment_id.in_(list(comment_ids))))
+    return {comment_id: updated_at for comment_id, updated_at in rows}
+
+
+def fetch_issue_ids(session: Session, owner: str, repo: str, numbers: Iterable[int]) -> dict[int, int]:
+    rows = session.execute(
+        select(Issue.number, Issue.id).where(Issue.owner == owner, Issue.repo == repo, Issue.number.in_(list(numbers)))
+    )
+    return {number: issue_id for number, issue_id in rows}
+
+
+def fetch_comment_stats(session: Session, issue_ids: Iterable[int]) -> dict[int, tuple[int, datetime | None]]:
+    """Return how many comments each issue has stored and the newest stored `updated_at` among them."""
+    rows = session.execute(
+        select(Comment.issue_id, func.count(Comment.id), func.max(Comment.updated_at))
+        .where(Comment.issue_id.in_(list(issue_ids)))
+        .group_by(Comment.issue_id)
+    )
+    return {issue_id: (count, newest) for issue_id, count, newest in rows}
+
+
+def on_issue_conflict(insert_stmt: Insert, force: bool = False) -> Insert:
+    """Turn an `INSERT INTO issues` into an upsert that only rewrites issues whose `updated_at` changed."""
+    excluded = insert_stmt.excluded
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[Issue.owner, Issue.repo, Issue.number],
+        set_={
+            **{column: excluded[column] for column in ISSUE_UPDATE_COLUMNS},
+            "created_at": func.coalesce(excluded.created_at, Issue.created_at),
+            "updated_at": func.coalesce(excluded.updated_at, Issue.updated_at),
+        },
+        where=None if force else Issue.updated_at.is_distinct_from(excluded.updated_at),
+    )
+
+
+def on_comment_conflict(insert_stmt: Insert, force: bool = False) -> Insert:
+    excluded = insert_stmt.excluded
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[Comment.comment_id],
+        set_={
+            **{column: excluded[column] for column in COMMENT_UPDATE_COLUMNS},
+            "created_at": func.coalesce(excluded.created_at, Comment.created_at),
+            "updated_at": func.coalesce(excluded.updated_at, Comment.updated_at),
+        },
+        where=None if force else Comment.updated_at.is_distinct_from(excluded.updated_at),
+    )
+
+
+def upsert_issues(session: Session, rows: list[dict[str, Any]], force: bool = False) -> dict[int, int]:
+    """Insert or update issues of one repository in one statement and return `{number: id}` of the rows actually written.
+
+    Rows whose `updated_at` matches the stored one are left untouched by the WHERE clause, so
+    concurrent writers cannot make an unchanged issue look updated. `force` drops that clause.
+    """
+    if not rows:
+        return {}
+
+    stmt = on_issue_conflict(insert(Issue).values(rows), force).returning(Issue.number, Issue.id)
+    return {number: issue_id for number, issue_id in session.execute(stmt)}
+
+
+def enqueue_embeddings(session: Session, comment_ids: Iterable[int]) -> None:
+    """Mark comments as needing (re-)embedding, in the transaction that wrote them.
+
+    A comment already in the outbox is re-queued, even if its previous entry was processed.
+    """
+    rows = [{"comment_id": comment_id} for comment_id in sorted(set(comment_ids))]
+    if not rows:
+        return
+
+    stmt = insert(EmbeddingOutbox).values(rows)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[EmbeddingOutbox.comment_id],
+            set_={"enqueued_at": func.now(), "processed_at": None},
+        )
+    )
+
+
+def upsert_comments(session: Session, rows: list[dict[str, Any]], force: bool = False) -> int:
+    """Insert or update comments in one statement, queue them for embedding and return how many rows were written."""
+    if not rows:
+        return 0
+
+    stmt = on_comment_conflict(insert(Comment).values(rows), force).returning(Comment.comment_id)
+    written = list(session.execute(stmt).scalars())
+    enqueue_embeddings(session, written)
+    return len(written)
@@ -1,7 +1,22 @@
 from datetime import datetime
 
 from pydantic import BaseModel, Field
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from src.utils.config import settings
@@ -25,10 +40,17 @@ class Base(DeclarativeBase):
 
 class Issue(Base):  # type: ignore
     __tablename__ = settings.ISSUES_TABLE_NAME
+    # Issue numbers are only unique within a repository; the key also serves lookups by owner/repo
+    __table_args__ = (
+        UniqueConstraint("owner", "repo", "number", name="uq_issues_owner_repo_number"),
+        Index("ix_issues_owner_repo_updated_at", "owner", "repo", "updated_at"),
+        Index("ix_issues_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
-    owner: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    owner: Mapped[str] = mapped_column(String(100), nullable=False)
     repo: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
-    number: Mapped[int] = mapped_column(Integer, unique=True, index=True, nullable=False)
+    number: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
     title: Mapped[str] = mapped_column(String(300), nullable=False)
     body: Mapped[str | None] = mapped_column(Text, nullable=True)
     state: Mapped[str | None] = mapped_column(String(20), nullable=True)
@@ -38,12 +60,29 @@ class Issue(Base):  # type: ignore
     updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     is_bug: Mapped[bool] = mapped_column(Boolean, default=False)
     is_feature: Mapped[bool] = mapped_column(Boolean, default=False)
+    # Maintained by Postgres, so every write path (ORM, upserts, COPY) keeps it current. Deferred,
+    # since it is only used inside SQL filters and would otherwise be loaded with every issue
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
 
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="issue", cascade="all, delete-orphan")
 
 
 class Comment(Base):  # type: ignore
     __tablename__ = settings.COMMENTS_TABLE_NAME
+    __table_args__ = (
+        Index("ix_comments_issue_id_created_at", "issue_id", "created_at"),
+        Index("ix_comments_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, index=True)
     comment_id: Mapped[int] = mapped_column(BigInteger, unique=True, index=True, nullable=False)
     issue_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("issues.id"), nullable=False)
@@ -51,5 +90,62 @@ class Comment(Base):  # type: ignore
     body: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(body, ''))", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
 
     issue: Mapped["Issue"] = relationship("Issue", back_populates="comments")
+
+
+class EmbeddingOutbox(Base):  # type: ignore
+    """Comments whose text changed since they were last embedded, written in the same transaction as the comment."""
+
+    __tablename__ = "embedding_outbox"
+    __table_args__ = (Index("ix_embedding_outbox_pending", "id", postgresql_where=text("processed_at IS NULL")),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    comment_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("comments.comment_id", ondelete="CASCADE"), unique=True, nullable=False
+    )
+    enqueued_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, server_default=func.now())
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class SyncState(Base):  # type: ignore
+    __tablename__ = "sync_state"
+    __table_args__ = (UniqueConstraint("owner", "repo", name="uq_sync_state_owner_repo"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    owner: Mapped[str] = mapped_column(String(100), nullable=False)
+    repo: Mapped[str] = mapped_column(String(100), nullable=False)
+    last_updated_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Progress of an unfinished run, cleared once its watermark is committed
+    checkpoint_page: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    checkpoint_cursor: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    checkpoint_since: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    checkpoint_started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Collector that wrote the checkpoint; REST cursors are update times, GraphQL ones opaque page cursors
+    checkpoint_mode: Mapped[str | None] = mapped_column(String(20), nullable=True)
+
+
+class SyncCheckpoint(BaseModel):
+    page: int | None = None
+    cursor: str | None = None
+    since: datetime | None = None
+    started_at: datetime
+    mode: str | None = None
+
+
+class RateLimitState(Base):  # type: ignore
+    __tablename__ = "github_rate_limits"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    remaining: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    used: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    reset_at: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    next_slot: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    backoff_until: Mapped[float] = mapped_column(Float, nullable=False, default=0)
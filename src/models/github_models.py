@@ -1,5 +1,6 @@
 # src/models/github_models.py
 
+from dataclasses import dataclass, field
 
 from pydantic import BaseModel
 
@@ -22,6 +23,7 @@ class GitHubIssue(BaseModel):
     created_at: str
     updated_at: str
     labels: list[GitHubLabel] | None = []
+    comments: int | None = None
 
 
 class GitHubComment(BaseModel):
@@ -30,3 +32,46 @@ class GitHubComment(BaseModel):
     body: str
     created_at: str | None
     updated_at: str | None
+    issue_url: str | None = None
+
+
+# Slotted, validation-free counterparts of the models above, built by `src.data_pipeline.fast_decode`.
+# Field names match, so the collectors read either kind the same way.
+
+
+@dataclass(slots=True)
+class FastGitHubLabel:
+    name: str
+
+
+@dataclass(slots=True)
+class FastGitHubUser:
+    login: str
+
+
+@dataclass(slots=True)
+class FastGitHubIssue:
+    number: int
+    title: str
+    body: str | None
+    state: str
+    user: FastGitHubUser
+    html_url: str
+    created_at: str
+    updated_at: str
+    labels: list[FastGitHubLabel] | None = field(default_factory=list)
+    comments: int | None = None
+
+
+@dataclass(slots=True)
+class FastGitHubComment:
+    id: int
+    user: FastGitHubUser
+    body: str
+    created_at: str | None
+    updated_at: str | None
+    issue_url: str | None = None
+
+
+AnyGitHubIssue = GitHubIssue | FastGitHubIssue
+AnyGitHubComment = GitHubComment | FastGitHubComment
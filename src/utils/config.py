@@ -14,6 +14,22 @@ class Settings(BaseSettings):
 
     AWS_REGION: str = "eu-central-1"
     GH_TOKEN: str = ""
+    GH_TOKENS: str = ""
+    GH_API_URL: str = "https://api.github.com"
+    GH_PARALLEL_REPOS: int = 4
+    GH_MAX_CONCURRENCY: int = 10
+    GH_HTTP_CACHE_PATH: str = ".cache/github_http_cache.json"
+    GH_GRAPHQL_PAGE_SIZE: int = 50
+    GH_GRAPHQL_COMMENTS_FIRST: int = 20
+    GH_GRAPHQL_MAX_COST: int = 10
+    GH_RATE_LIMIT_STORE: str = "file"
+    GH_RATE_LIMIT_STATE_PATH: str = ".cache/github_rate_limit.json"
+    GH_RATE_LIMIT_MARGIN: int = 50
+    GH_MAX_RETRIES: int = 5
+    GH_BACKOFF_BASE: float = 2.0
+    GH_BACKOFF_MAX: float = 300.0
+    GH_RAW_ARCHIVE_PATH: str = "data/raw_archive"
+    GH_FAST_DECODE: bool = False
     ISSUES_TABLE_NAME: str = "issues"
     COMMENTS_TABLE_NAME: str = "comments"
     POSTGRES_USER: str = ""
@@ -21,6 +37,13 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "github_issues"
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: str = "5432"
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_SECRET_TTL: int = 3600
     ADMINER_PORT: str = "8080"
     SECRET_NAME: str = ""
     APP_ENV: str = "dev"
@@ -28,11 +51,22 @@ class Settings(BaseSettings):
     QDRANT_API_KEY: str = ""
     QDRANT_URL: str = ""
     DENSE_MODEL_NAME: str = "BAAI/bge-large-en-v1.5"
+    DENSE_MODEL_MAX_TOKENS: int = 512  # input limit of the dense model's tokenizer, special tokens included
     SPARSE_MODEL_NAME: str = "Qdrant/minicoil-v1"
     COLLECTION_NAME: str = "github_issues_embeddings"
-    CHUNK_SIZE: int = 1000
+    CHUNK_SIZE: int = 1000  # characters of a lexical search hit returned as its chunk_text
+    # Embedding chunks, in dense model tokens; must leave room for the special tokens below DENSE_MODEL_MAX_TOKENS
+    CHUNK_MAX_TOKENS: int = 500
+    CHUNK_OVERLAP_TOKENS: int = 50
     BATCH_SIZE: int = 20
+    EMBED_BATCH_SIZE: int = 256
+    EMBED_WORKERS: int = 0  # 0 = one embedding thread per CPU core
+    EMBEDDING_CACHE_PATH: str = ".cache/embedding_cache.sqlite3"  # empty disables the cache
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 1_000_000
     CONCURRENT_COMMENTS: int = 5
+    EMBEDDING_PAGE_SIZE: int = 200
+    OUTBOX_BATCH_SIZE: int = 200
+    VECTOR_SEARCH_TIMEOUT: float = 5.0
     LANGSMITH_API_KEY: str = ""
     OPENAI_API_KEY: SecretStr = SecretStr("")
     LLM_MODEL_NAME: str = "gpt-4o-mini"
@@ -0,0 +1,147 @@
+import re
+from collections import deque
+from collections.abc import Callable
+
+from src.utils.config import settings
+
+# Bump when the splitting rules change, so stored comments are re-chunked by the next ingestion
+CHUNKER_VERSION = 1
+FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+# Oversized blocks are split at line breaks first, then between words
+SEPARATORS = ["\n", " "]
+
+Piece = tuple[str, int]
+
+
+def is_closing_fence(line: str, fence: str) -> bool:
+    stripped = line.strip()
+    return stripped.startswith(fence) and set(stripped) == {fence[0]}
+
+
+def markdown_blocks(text: str) -> list[str]:
+    """Paragraphs and fenced code blocks of a markdown text.
+
+    Paragraphs end at blank lines; a fenced block runs up to its closing fence, blank lines
+    included, so code and pasted stack traces inside fences always stay in one block.
+    """
+    blocks: list[str] = []
+    lines: list[str] = []
+    fence: str | None = None
+
+    def flush() -> None:
+        if lines:
+            blocks.append("\n".join(lines))
+            lines.clear()
+
+    for line in text.splitlines():
+        if fence is not None:
+            lines.append(line)
+            if is_closing_fence(line, fence):
+                flush()
+                fence = None
+        elif match := FENCE.match(line):
+            flush()
+            fence = match.group(1)
+            lines.append(line)
+        elif line.strip():
+            lines.append(line)
+        else:
+            flush()
+    flush()
+    return blocks
+
+
+class TextChunker:
+    """Split text into chunks of at most `max_tokens` tokens, as counted by the embedding model's tokenizer.
+
+    Paragraphs and fenced code blocks are packed whole into chunks whenever they fit. Larger
+    blocks are split at line breaks, then between words, and split code blocks are re-fenced
+    so every chunk stays valid markdown. Each chunk starts with up to `overlap_tokens` tokens
+    of the previous chunk's trailing paragraphs or lines.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        max_tokens: int = settings.CHUNK_MAX_TOKENS,
+        overlap_tokens: int = settings.CHUNK_OVERLAP_TOKENS,
+        input_limit: int | None = None,
+    ) -> None:
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError(f"Chunk overlap must be between 0 and {max_tokens - 1} tokens, got {overlap_tokens}")
+        self.count_tokens = count_tokens
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        # Tokens added to every text, e.g. [CLS] and [SEP], which the chunk budget does not cover
+        self.special_tokens = count_tokens("")
+        # A tokenizer that truncates at `input_limit` never counts more than that, so a chunk budget
+        # reaching the limit would count every oversized block as fitting
+        if input_limit is not None and max_tokens + self.special_tokens >= input_limit:
+            raise ValueError(
+                f"Chunks of {max_tokens} tokens plus {self.special_tokens} special tokens "
+                f"must stay below the model's {input_limit}-token input limit"
+            )
+
+    def tokens(self, text: str) -> int:
+        return self.count_tokens(text) - self.special_tokens
+
+    def split(self, text: str) -> list[str]:
+        pieces = [piece for block in markdown_blocks(text) for piece in self.fit_block(block)]
+        return [chunk for chunk, _ in self.pack(pieces, "\n\n", self.max_tokens)]
+
+    def fit_block(self, block: str) -> list[Piece]:
+        lines = block.split("\n")
+        fence = FENCE.match(lines[0])
+        if fence is None or len(lines) < 2:
+            return self.fit(block, SEPARATORS, self.max_tokens)
+
+        block_tokens = self.tokens(block)
+        if block_tokens <= self.max_tokens:
+            return [(block, block_tokens)]
+
+        opening = lines[0]
+        closed = is_closing_fence(lines[-1], fence.group(1))
+        closing = lines[-1] if closed else fence.group(1)
+        body = "\n".join(lines[1:-1] if closed else lines[1:])
+        fence_tokens = self.tokens(f"{opening}\n{closing}")
+        return [
+            (f"{opening}\n{piece}\n{closing}", tokens + fence_tokens)
+            for piece, tokens in self.fit(body, SEPARATORS, self.max_tokens - fence_tokens)
+        ]
+
+    def fit(self, text: str, separators: list[str], limit: int) -> list[Piece]:
+        """`text` as pieces of at most `limit` tokens, split at the coarsest separator that works."""
+        tokens = self.tokens(text)
+        if tokens <= limit:
+            return [(text, tokens)]
+        if not separators:
+            return self.pack(self.bisect(text, limit), "", limit)
+
+        separator, finer = separators[0], separators[1:]
+        parts = [piece for part in text.split(separator) if part.strip() for piece in self.fit(part, finer, limit)]
+        return self.pack(parts, separator, limit)
+
+    def bisect(self, text: str, limit: int) -> list[Piece]:
+        """Last resort for a single huge word, e.g. a base64 blob or minified line."""
+        tokens = self.tokens(text)
+        if tokens <= limit or len(text) < 2:
+            return [(text, tokens)]
+        middle = len(text) // 2
+        return self.bisect(text[:middle], limit) + self.bisect(text[middle:], limit)
+
+    def pack(self, pieces: list[Piece], separator: str, limit: int) -> list[Piece]:
+        """Greedily join consecutive pieces into chunks of at most `limit` tokens, with overlap."""
+        chunks: list[Piece] = []
+        window: deque[Piece] = deque()
+        window_tokens = 0
+        for text, tokens in pieces:
+            if window and window_tokens + tokens > limit:
+                chunks.append((separator.join(piece for piece, _ in window), window_tokens))
+                # Keep the tail of the finished chunk as the start of the next one
+                while window and (window_tokens > self.overlap_tokens or window_tokens + tokens > limit):
+                    window_tokens -= window.popleft()[1]
+            window.append((text, tokens))
+            window_tokens += tokens
+        if window:
+            chunks.append((separator.join(piece for piece, _ in window), window_tokens))
+        return chunks
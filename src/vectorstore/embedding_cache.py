@@ -0,0 +1,93 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.utils.config import settings
+
+
+class EmbeddingCache:
+    """Persistent, size-bounded cache of embedding vectors keyed by `(model_name, sha256(text))`.
+
+    Vectors are stored as raw float32 / int32 blobs in SQLite. Every hit refreshes the entry's
+    `last_used`, and once the cache holds more than `max_entries` rows the least recently used
+    ones are evicted. The row count is read once on open and kept up to date in memory, so
+    writes never scan the table. The connection is shared by the embedding threads behind a lock.
+    """
+
+    def __init__(
+        self, path: str = settings.EMBEDDING_CACHE_PATH, max_entries: int = settings.EMBEDDING_CACHE_MAX_ENTRIES
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key BLOB NOT NULL, value BLOB NOT NULL, last_used INTEGER NOT NULL, "
+            "PRIMARY KEY (model, key)) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)")
+        self.conn.commit()
+        (self.count,) = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.sha256(text.encode()).digest()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> list[bytes | None]:
+        """Cached blobs in the order of `texts`, `None` for misses."""
+        keys = [self.key(text) for text in texts]
+        with self.lock:
+            found: dict[bytes, bytes] = {}
+            # Stay below SQLite's bound parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, value FROM embeddings WHERE model = ? AND key IN ({placeholders})", [model, *chunk]
+                )
+                found.update(rows)
+            if found:
+                now = time.time_ns()
+                self.conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                    [(now, model, key) for key in found],
+                )
+                self.conn.commit()
+            self.hits += sum(key in found for key in keys)
+            self.misses += sum(key not in found for key in keys)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, model: str, items: Sequence[tuple[str, bytes]]) -> None:
+        if not items:
+            return
+        now = time.time_ns()
+        with self.lock:
+            # A key already stored holds the same vector, so only new rows are written and counted
+            self.count += self.conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, key, value, last_used) VALUES (?, ?, ?, ?)",
+                [(model, self.key(text), value, now) for text, value in items],
+            ).rowcount
+            if self.count > self.max_entries:
+                self.count -= self.conn.execute(
+                    "DELETE FROM embeddings WHERE (model, key) IN "
+                    "(SELECT model, key FROM embeddings ORDER BY last_used LIMIT ?)",
+                    (self.count - self.max_entries,),
+                ).rowcount
+            self.conn.commit()
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
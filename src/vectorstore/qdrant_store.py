@@ -1,15 +1,34 @@
+import asyncio
+import os
 import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
+import numpy as np
 from fastembed import SparseTextEmbedding, TextEmbedding
 from loguru import logger
 from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import Distance, PayloadSchemaType, models
 
 from src.utils.config import settings
+from src.vectorstore.chunker import TextChunker
+from src.vectorstore.embedding_cache import EmbeddingCache
+
+
+def encode_sparse(vector: tuple[np.ndarray, np.ndarray]) -> bytes:
+    indices, values = vector
+    return indices.astype(np.int32).tobytes() + values.astype(np.float32).tobytes()
+
+
+def decode_sparse(blob: bytes) -> tuple[np.ndarray, np.ndarray]:
+    # Same number of int32 indices and float32 values, so the blob splits in half
+    half = len(blob) // 2
+    return np.frombuffer(blob[:half], dtype=np.int32), np.frombuffer(blob[half:], dtype=np.float32)
 
 
 class AsyncQdrantVectorStore:
-    def __init__(self) -> None:
+    def __init__(self, cache: EmbeddingCache | None = None) -> None:
         self.client = AsyncQdrantClient(url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY)
 
         self.collection_name = f"{settings.APP_ENV}_{settings.COLLECTION_NAME}"
@@ -17,6 +36,14 @@ class AsyncQdrantVectorStore:
 
         self.dense_model = TextEmbedding(model_name=settings.DENSE_MODEL_NAME)
         self.sparse_model = SparseTextEmbedding(model_name=settings.SPARSE_MODEL_NAME)
+        self.cache = cache
+        # Chunks are sized with the dense model's own tokenizer, so none is truncated at embedding time
+        self.chunker = TextChunker(self.dense_model.token_count, input_limit=settings.DENSE_MODEL_MAX_TOKENS)
+        # onnxruntime releases the GIL during inference, so threads run the models in parallel
+        # while the event loop keeps serving Qdrant and database I/O
+        self.embed_executor = ThreadPoolExecutor(
+            max_workers=settings.EMBED_WORKERS or os.cpu_count() or 1, thread_name_prefix="embed"
+        )
 
         self.quantization_config = models.ScalarQuantization(
             scalar=models.ScalarQuantizationConfig(
@@ -28,18 +55,66 @@ class AsyncQdrantVectorStore:
 
         self.sparse_vectors_config = {"miniCOIL": models.SparseVectorParams(modifier=models.Modifier.IDF)}
 
+    def embed_cached(
+        self,
+        model_name: str,
+        texts: list[str],
+        embed: Callable[[list[str]], list[Any]],
+        encode: Callable[[Any], bytes],
+        decode: Callable[[bytes], Any],
+    ) -> list[Any]:
+        """Run `embed` only on the texts missing from the cache, then store their vectors."""
+        if self.cache is None:
+            return embed(texts)
+
+        cached = self.cache.get_many(model_name, texts)
+        missing = [text for text, blob in zip(texts, cached, strict=True) if blob is None]
+        fresh = iter(embed(missing) if missing else [])
+
+        vectors, new_entries = [], []
+        for text, blob in zip(texts, cached, strict=True):
+            if blob is None:
+                vector = next(fresh)
+                new_entries.append((text, encode(vector)))
+                vectors.append(vector)
+            else:
+                vectors.append(decode(blob))
+        self.cache.put_many(model_name, new_entries)
+        return vectors
+
+    def embed_dense(self, texts: list[str]) -> list[list[float]]:
+        vectors = self.embed_cached(
+            settings.DENSE_MODEL_NAME,
+            texts,
+            lambda batch: list(self.dense_model.embed(batch, batch_size=settings.EMBED_BATCH_SIZE)),
+            lambda vec: vec.astype(np.float32).tobytes(),
+            lambda blob: np.frombuffer(blob, dtype=np.float32),
+        )
+        return [vec.tolist() for vec in vectors]
+
+    def embed_sparse(self, texts: list[str]) -> list[models.SparseVector]:
+        vectors = self.embed_cached(
+            settings.SPARSE_MODEL_NAME,
+            texts,
+            lambda batch: [
+                (se.indices, se.values) for se in self.sparse_model.embed(batch, batch_size=settings.EMBED_BATCH_SIZE)
+            ],
+            encode_sparse,
+            decode_sparse,
+        )
+        return [models.SparseVector(indices=indices.tolist(), values=values.tolist()) for indices, values in vectors]
+
     async def dense_vectors(self, texts: list[str]) -> list[list[float]]:
-        # Embedding is sync, no need to await
-        return [vec.tolist() for vec in self.dense_model.embed(texts)]
+        return await asyncio.get_running_loop().run_in_executor(self.embed_executor, self.embed_dense, texts)
 
     async def sparse_vectors(self, texts: list[str]) -> list[models.SparseVector]:
-        return [
-            models.SparseVector(
-                indices=se.indices.tolist(),
-                values=se.values.tolist(),
-            )
-            for se in self.sparse_model.embed(texts)
-        ]
+        return await asyncio.get_running_loop().run_in_executor(self.embed_executor, self.embed_sparse, texts)
+
+    def close(self) -> None:
+        self.embed_executor.shutdown(wait=True, cancel_futures=True)
+        if self.cache is not None:
+            logger.info(f"Embedding cache: {self.cache.stats()}")
+            self.cache.close()
 
     async def create_collection(self) -> None:
         try:
@@ -82,9 +157,18 @@ class AsyncQdrantVectorStore:
         except Exception as e:
             logger.info(f"Index for 'comment_id' may already exist or failed: {e}")
 
+        try:
+            await self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="chunk_index",
+                field_schema=PayloadSchemaType.INTEGER,
+            )
+        except Exception as e:
+            logger.info(f"Index for 'chunk_index' may already exist or failed: {e}")
+
     async def search_similar_issues(self, query_text: str, limit: int = 5) -> list[models.ScoredPoint]:
-        dense_vector = (await self.dense_vectors([query_text]))[0]
-        sparse_vector = (await self.sparse_vectors([query_text]))[0]
+        dense, sparse = await asyncio.gather(self.dense_vectors([query_text]), self.sparse_vectors([query_text]))
+        dense_vector, sparse_vector = dense[0], sparse[0]
 
         results = await self.client.query_points(
             collection_name=self.collection_name,
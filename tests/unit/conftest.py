@@ -0,0 +1,58 @@
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from src.models.github_models import GitHubIssue
+
+
+@pytest.fixture
+def issue_payload() -> Callable[..., dict[str, Any]]:
+    """Factory for raw issues as the GitHub REST API returns them; extra fields override the defaults."""
+
+    def make(number: int, updated_at: str = "2025-01-02T00:00:00Z", **fields: Any) -> dict[str, Any]:
+        return {
+            "number": number,
+            "title": f"Issue {number}",
+            "body": "body",
+            "state": "open",
+            "user": {"login": "octocat"},
+            "html_url": f"https://github.com/owner/repo/issues/{number}",
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": updated_at,
+            "labels": [],
+            **fields,
+        }
+
+    return make
+
+
+@pytest.fixture
+def comment_payload() -> Callable[..., dict[str, Any]]:
+    """Factory for raw comments as the GitHub REST API returns them; `issue_number` sets `issue_url`."""
+
+    def make(
+        comment_id: int, issue_number: int | None = None, updated_at: str = "2025-01-01T00:00:00Z", **fields: Any
+    ) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "id": comment_id,
+            "user": {"login": "octocat"},
+            "body": "comment",
+            "created_at": "2025-01-01T00:00:00Z",
+            "updated_at": updated_at,
+        }
+        if issue_number is not None:
+            payload["issue_url"] = f"https://api.github.com/repos/owner/repo/issues/{issue_number}"
+        return {**payload, **fields}
+
+    return make
+
+
+@pytest.fixture
+def make_issue(issue_payload: Callable[..., dict[str, Any]]) -> Callable[..., GitHubIssue]:
+    """Factory for parsed `GitHubIssue`s, taking the same arguments as `issue_payload`."""
+
+    def make(number: int, updated_at: str = "2025-01-02T00:00:00Z", **fields: Any) -> GitHubIssue:
+        return GitHubIssue.model_validate(issue_payload(number, updated_at, **fields))
+
+    return make
@@ -0,0 +1,123 @@
+import threading
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from src.data_pipeline.async_ingestion import AsyncGitHubIssuesCollector
+
+
+@pytest.fixture
+def fake_github(
+    issue_payload: Callable[..., dict[str, Any]], comment_payload: Callable[..., dict[str, Any]]
+) -> Callable[[httpx.Request], httpx.Response]:
+    def handle(request: httpx.Request) -> httpx.Response:
+        headers = {"X-RateLimit-Remaining": "5000"}
+        if request.url.path.endswith("/issues"):
+            page = int(request.url.params["page"])
+            issues = [issue_payload(1), issue_payload(2), issue_payload(3, pull_request={})] if page == 1 else []
+            return httpx.Response(200, json=issues, headers=headers)
+
+        issue_number = int(request.url.path.split("/")[-2])
+        page = int(request.url.params["page"])
+        comments = [comment_payload(issue_number * 10 + i) for i in range(2)] if page == 1 else []
+        return httpx.Response(200, json=comments, headers=headers)
+
+    return handle
+
+
+@pytest.mark.asyncio
+async def test_collect_fetches_comments_for_all_saved_issues(
+    fake_github: Callable[[httpx.Request], httpx.Response],
+) -> None:
+    collector = AsyncGitHubIssuesCollector(db=MagicMock(), max_concurrency=2)
+
+    with (
+        patch.object(
+            collector,
+            "build_client",
+            return_value=httpx.AsyncClient(transport=httpx.MockTransport(fake_github)),
+        ),
+        patch.object(collector, "issues_needing_comments", side_effect=lambda issues, owner, repo: issues),
+        patch.object(collector, "save_issues_to_db", return_value=True) as mock_save,
+        patch.object(collector, "resolve_watermark", return_value=None),
+        patch.object(collector, "commit_watermark") as mock_commit_watermark,
+    ):
+        await collector.collect("owner", "repo", max_pages=2)
+
+    # Pull requests are filtered out, both real issues are saved with two comments each in one transaction
+    issues, _, _, comments_by_issue = mock_save.call_args.args
+    assert [issue.number for issue in issues] == [1, 2]
+    assert {number: len(comments) for number, comments in comments_by_issue.items()} == {1: 2, 2: 2}
+    mock_save.assert_called_once()
+    mock_commit_watermark.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_collect_skips_watermark_when_save_fails(
+    fake_github: Callable[[httpx.Request], httpx.Response],
+) -> None:
+    collector = AsyncGitHubIssuesCollector(db=MagicMock())
+
+    with (
+        patch.object(
+            collector,
+            "build_client",
+            return_value=httpx.AsyncClient(transport=httpx.MockTransport(fake_github)),
+        ),
+        patch.object(collector, "issues_needing_comments", return_value=[]),
+        patch.object(collector, "save_issues_to_db", return_value=False),
+        patch.object(collector, "resolve_watermark", return_value=None),
+        patch.object(collector, "commit_watermark") as mock_commit_watermark,
+    ):
+        await collector.collect("owner", "repo", max_pages=2)
+
+    mock_commit_watermark.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fetch_page_calls_the_governor_off_the_event_loop(
+    fake_github: Callable[[httpx.Request], httpx.Response],
+) -> None:
+    threads = []
+    governor = MagicMock()
+    governor.reserve.side_effect = lambda key: threads.append(threading.current_thread()) or 0
+    governor.record.side_effect = lambda key, headers: threads.append(threading.current_thread())
+    governor.is_rate_limited.return_value = False
+    collector = AsyncGitHubIssuesCollector(db=MagicMock(), governor=governor)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake_github))
+
+    async with client:
+        page = await collector.fetch_page(client, "https://api.github.com/repos/owner/repo/issues", {"page": "2"})
+
+    assert page == []
+    # The file and Postgres stores block on locks, so they must not run on the event loop thread
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_unchanged_short_issue_page_ends_the_listing() -> None:
+    cache = MagicMock()
+    cache.conditional_headers.return_value = {"If-None-Match": "etag"}
+    cache.get.return_value = {"etag": "etag", "item_count": 3}
+    collector = AsyncGitHubIssuesCollector(db=MagicMock(), cache=cache)
+    requests_seen = []
+
+    def not_modified(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request)
+        return httpx.Response(304, headers={"X-RateLimit-Remaining": "5000"})
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(not_modified)) as client:
+        issues = await collector.get_issues_async(client, "owner", "repo", max_pages=5)
+
+    assert issues == []
+    assert len(requests_seen) == 1
+
+
+def test_async_collector_honors_bulk_write_options() -> None:
+    collector = AsyncGitHubIssuesCollector(db=MagicMock(), bulk_upserts=True, copy_load=True)
+
+    assert collector.bulk_upserts and collector.copy_load
@@ -0,0 +1,74 @@
+import pytest
+
+from src.vectorstore.chunker import TextChunker, markdown_blocks
+
+
+def count_words(text: str) -> int:
+    # One token per word, plus two special tokens per text like the real tokenizer
+    return len(text.split()) + 2
+
+
+def test_short_text_is_a_single_chunk() -> None:
+    chunker = TextChunker(count_words, max_tokens=10, overlap_tokens=2)
+
+    assert chunker.split("A short comment.\n\nWith two paragraphs.") == ["A short comment.\n\nWith two paragraphs."]
+    assert chunker.split("  \n\n ") == []
+
+
+def test_fenced_code_blocks_stay_whole() -> None:
+    text = "Fails with:\n\n```\nTraceback (most recent call last):\n\n  File x\nValueError\n```\nAny ideas?"
+
+    assert markdown_blocks(text) == [
+        "Fails with:",
+        "```\nTraceback (most recent call last):\n\n  File x\nValueError\n```",
+        "Any ideas?",
+    ]
+
+
+def test_paragraphs_are_packed_up_to_the_token_limit() -> None:
+    chunker = TextChunker(count_words, max_tokens=6, overlap_tokens=0)
+
+    assert chunker.split("one two\n\nthree four\n\nfive six\n\nseven") == [
+        "one two\n\nthree four\n\nfive six",
+        "seven",
+    ]
+
+
+def test_chunks_overlap_with_the_previous_chunk() -> None:
+    chunker = TextChunker(count_words, max_tokens=4, overlap_tokens=2)
+
+    assert chunker.split("one two\n\nthree four\n\nfive six") == [
+        "one two\n\nthree four",
+        "three four\n\nfive six",
+    ]
+
+
+def test_oversized_code_blocks_are_split_by_line_and_refenced() -> None:
+    # The fence lines take two of the five tokens, leaving room for one line of code per chunk
+    chunker = TextChunker(count_words, max_tokens=5, overlap_tokens=0)
+
+    chunks = chunker.split("```python\na = 1\nb = 2\n```")
+
+    assert chunks == ["```python\na = 1\n```", "```python\nb = 2\n```"]
+
+
+def test_long_words_are_split_without_separators() -> None:
+    chunker = TextChunker(lambda text: len(text) + 2, max_tokens=10, overlap_tokens=0)
+
+    chunks = chunker.split("x" * 25)
+
+    assert all(len(chunk) <= 10 for chunk in chunks)
+    assert "".join(chunks) == "x" * 25
+
+
+def test_overlap_must_be_smaller_than_the_chunk() -> None:
+    with pytest.raises(ValueError):
+        TextChunker(count_words, max_tokens=10, overlap_tokens=10)
+
+
+def test_chunks_must_fit_below_the_model_input_limit() -> None:
+    # 510 tokens plus [CLS] and [SEP] reach the truncation point, where counts stop growing
+    with pytest.raises(ValueError):
+        TextChunker(count_words, max_tokens=510, overlap_tokens=50, input_limit=512)
+
+    assert TextChunker(count_words, max_tokens=500, overlap_tokens=50, input_limit=512).max_tokens == 500
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.database.copy_loader import CopyStream, copy_comments, copy_issues, copy_text
+
+
+def make_session(merge_result: Any) -> tuple[MagicMock, list[str]]:
+    """Session whose COPY drains the stream in small reads and whose merge returns `merge_result`."""
+    copied: list[str] = []
+    session = MagicMock()
+
+    def copy_expert(sql: str, stream: CopyStream) -> None:
+        while chunk := stream.read(7):
+            copied.append(chunk)
+
+    session.connection.return_value.connection.cursor.return_value.copy_expert.side_effect = copy_expert
+    session.execute.side_effect = lambda stmt: merge_result if hasattr(stmt, "table") else MagicMock()
+    return session, copied
+
+
+def merge_sql(session: MagicMock, table_name: str) -> str:
+    stmt = next(
+        call.args[0]
+        for call in session.execute.call_args_list
+        if getattr(getattr(call.args[0], "table", None), "name", None) == table_name
+    )
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_copy_text_escapes_text_format_specials() -> None:
+    assert copy_text(None) == r"\N"
+    assert copy_text(True) == "t"
+    assert copy_text(datetime(2025, 1, 2, 3, 4, 5)) == "2025-01-02 03:04:05"
+    assert copy_text("a\tb\nc\\d") == "a\\tb\\nc\\\\d"
+
+
+def test_copy_issues_streams_rows_and_merges_latest_version() -> None:
+    session, copied = make_session([(1, 10)])
+    rows = [
+        {
+            "owner": "o",
+            "repo": "r",
+            "number": 1,
+            "title": "Crash",
+            "body": "line one\nline two",
+            "state": "open",
+            "author": "octocat",
+            "url": None,
+            "created_at": datetime(2025, 1, 1),
+            "updated_at": datetime(2025, 1, 2),
+            "is_bug": True,
+            "is_feature": False,
+        }
+    ]
+
+    assert copy_issues(session, iter(rows)) == {1: 10}
+
+    assert (
+        "".join(copied)
+        == "o\tr\t1\tCrash\tline one\\nline two\topen\toctocat\t\\N\t2025-01-01 00:00:00\t2025-01-02 00:00:00\tt\tf\n"
+    )
+    sql = merge_sql(session, "issues")
+    assert "DISTINCT ON (issues_staging.owner, issues_staging.repo, issues_staging.number)" in sql
+    assert "ON CONFLICT (owner, repo, number) DO UPDATE" in sql
+    assert "IS DISTINCT FROM excluded.updated_at" in sql
+
+
+def test_copy_comments_resolves_issue_ids_with_a_join() -> None:
+    session, _ = make_session(MagicMock(scalars=MagicMock(return_value=[100])))
+    rows = [
+        {
+            "comment_id": 100,
+            "owner": "o",
+            "repo": "r",
+            "issue_number": 1,
+            "author": "octocat",
+            "body": "Same here",
+            "created_at": None,
+            "updated_at": None,
+        }
+    ]
+
+    assert copy_comments(session, rows, force=True) == 1
+
+    sql = merge_sql(session, "comments")
+    assert "JOIN issues ON issues.owner = comments_staging.owner" in sql
+    assert "ON CONFLICT (comment_id) DO UPDATE" in sql
+    assert "IS DISTINCT FROM" not in sql
+    assert "ON CONFLICT (comment_id) DO UPDATE SET enqueued_at = now()" in merge_sql(session, "embedding_outbox")
+
+
+def test_copy_issues_skips_merge_without_rows() -> None:
+    session, _ = make_session([])
+
+    assert copy_issues(session, []) == {}
+    # Only the staging DDL and TRUNCATE ran
+    assert session.execute.call_count == 2
@@ -1,36 +1,209 @@
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.data_pipeline.ingest_embeddings import ingest_issues_to_qdrant_async
+from src.data_pipeline.ingest_embeddings import (
+    chunk_point_id,
+    content_hash,
+    ingest_issues_to_qdrant_async,
+    ingest_outbox_to_qdrant_async,
+    load_ingestion_manifest,
+    upsert_comments_batched,
+)
+from src.vectorstore.chunker import TextChunker
+
+
+def word_chunker(max_tokens: int = 500) -> TextChunker:
+    # One token per word, plus two special tokens per text like the real tokenizer
+    return TextChunker(lambda text: len(text.split()) + 2, max_tokens=max_tokens, overlap_tokens=0)
 
 
 @pytest.mark.asyncio
-@patch("src.database.session.db")
+@patch("src.data_pipeline.ingest_embeddings.EmbeddingCache")
 @patch("src.data_pipeline.ingest_embeddings.AsyncQdrantVectorStore")
-async def test_ingest_issues(mock_vectorstore_cls: MagicMock, mock_get_session: MagicMock) -> None:
-    # Setup mock session and query return values
+async def test_ingest_issues(mock_vectorstore_cls: MagicMock, mock_cache_cls: MagicMock) -> None:
+    # Setup mock async session and query return values
     mock_session = MagicMock()
-    mock_get_session.return_value = mock_session
+    mock_db = MagicMock()
+
+    @asynccontextmanager
+    async def session_scope() -> AsyncGenerator[MagicMock, None]:
+        yield mock_session
+
+    mock_db.session_scope = session_scope
 
-    # Mock issues query returning a list with one fake issue object
     fake_issue = MagicMock()
     fake_issue.id = 1
     fake_issue.number = 123
     fake_issue.repo = "repo"
     fake_issue.owner = "owner"
-    mock_session.query.return_value.yield_per.return_value = [fake_issue]
+
+    fake_comment = MagicMock()
+    fake_comment.id = 11
+    fake_comment.comment_id = 456
+    fake_comment.body = "A comment long enough to embed."
+    enqueued_at = datetime(2025, 1, 1)
+    # One page of comments with their pending outbox entry, the mark-done update, then an empty page
+    mock_session.execute = AsyncMock(side_effect=[[(7, enqueued_at, fake_comment, fake_issue)], None, []])
 
     # Setup AsyncQdrantVectorStore mock instance
     mock_vectorstore = mock_vectorstore_cls.return_value
+    mock_vectorstore.chunker = word_chunker()
     mock_vectorstore.collection_name = "test_collection"
     mock_vectorstore.client.upsert = AsyncMock()
     mock_vectorstore.dense_vectors = AsyncMock(return_value=[[0.1] * 10])
     mock_vectorstore.sparse_vectors = AsyncMock(return_value=[MagicMock(as_object=lambda: {"indices": [], "values": []})])
-    mock_vectorstore.client.scroll = AsyncMock(return_value=([], None))
+    # One stored comment whose text is unchanged, so only the new comment is embedded
+    stored = MagicMock(payload={"comment_id": 999, "content_hash": "x"})
+    mock_vectorstore.client.scroll = AsyncMock(return_value=([stored], None))
+    mock_vectorstore.client.delete = AsyncMock()
 
     # Run ingestion
-    await ingest_issues_to_qdrant_async()
+    await ingest_issues_to_qdrant_async(mock_db)
 
     # Assert that upsert was called at least once
     assert mock_vectorstore.client.upsert.await_count > 0
+    # The embedded comment's outbox entry is done, so the outbox run does not embed it again
+    assert mock_session.execute.await_args_list[1].args[1] == [{"entry_id": 7, "seen_at": enqueued_at}]
+    # The second page continues after the last comment of the first one
+    second_page = mock_session.execute.await_args_list[2].args[0].compile()
+    assert 11 in second_page.params.values()
+    mock_vectorstore.client.scroll.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_load_ingestion_manifest_pages_through_first_chunks() -> None:
+    qdrant = MagicMock()
+    qdrant.client.scroll = AsyncMock(
+        side_effect=[
+            ([MagicMock(payload={"comment_id": 1, "content_hash": "a"})], "next"),
+            ([MagicMock(payload={"comment_id": 2, "content_hash": "b"})], None),
+        ]
+    )
+
+    assert await load_ingestion_manifest(qdrant, page_size=1) == {1: "a", 2: "b"}
+
+    first, second = qdrant.client.scroll.await_args_list
+    assert first.kwargs["offset"] is None and second.kwargs["offset"] == "next"
+    assert first.kwargs["with_vectors"] is False
+    assert first.kwargs["scroll_filter"].must[0].key == "chunk_index"
+
+
+@pytest.mark.asyncio
+@patch("src.data_pipeline.ingest_embeddings.EmbeddingCache")
+@patch("src.data_pipeline.ingest_embeddings.AsyncQdrantVectorStore")
+async def test_ingest_outbox_reembeds_queued_comments_only(
+    mock_vectorstore_cls: MagicMock, mock_cache_cls: MagicMock
+) -> None:
+    mock_session = MagicMock()
+    mock_db = MagicMock()
+
+    @asynccontextmanager
+    async def session_scope() -> AsyncGenerator[MagicMock, None]:
+        yield mock_session
+
+    mock_db.session_scope = session_scope
+
+    fake_issue = MagicMock(id=1, number=123, repo="repo", owner="owner")
+    changed = MagicMock(comment_id=456, body="An edited comment.")
+    emptied = MagicMock(comment_id=789, body="")
+    unchanged = MagicMock(comment_id=321, body="Queued again, but already stored.")
+    enqueued_at = datetime(2025, 1, 1)
+    # First page of the outbox, the mark-done update, then an empty page
+    mock_session.execute = AsyncMock(
+        side_effect=[
+            [
+                (1, enqueued_at, changed, fake_issue),
+                (2, enqueued_at, emptied, fake_issue),
+                (3, enqueued_at, unchanged, fake_issue),
+            ],
+            None,
+            [],
+        ]
+    )
+
+    mock_vectorstore = mock_vectorstore_cls.return_value
+    mock_vectorstore.chunker = word_chunker()
+    mock_vectorstore.client.delete = AsyncMock()
+    mock_vectorstore.client.upsert = AsyncMock()
+    mock_vectorstore.dense_vectors = AsyncMock(return_value=[[0.1] * 10])
+    mock_vectorstore.sparse_vectors = AsyncMock(return_value=[{"indices": [], "values": []}])
+    stored = MagicMock(payload={"comment_id": 321, "content_hash": content_hash(unchanged.body)})
+    mock_vectorstore.client.retrieve = AsyncMock(return_value=[stored])
+
+    processed = await ingest_outbox_to_qdrant_async(mock_db)
+
+    assert processed == 3
+    # Only the first chunk of each queued comment is read back to compare hashes
+    assert mock_vectorstore.client.retrieve.await_args.kwargs["ids"] == [
+        chunk_point_id(456, 0),
+        chunk_point_id(789, 0),
+        chunk_point_id(321, 0),
+    ]
+    # The unchanged comment is not embedded again
+    mock_vectorstore.dense_vectors.assert_awaited_once_with(["An edited comment."])
+    # The edited comment is overwritten in place; one delete clears stale chunks of both
+    assert mock_vectorstore.client.upsert.await_count == 1
+    assert mock_vectorstore.client.delete.await_count == 1
+    stale = mock_vectorstore.client.delete.await_args.kwargs["points_selector"].filter.should
+    assert [(f.must[0].match.value, f.must_not[0].range.lt) for f in stale] == [(456, 1), (789, 0)]
+    mark_params = mock_session.execute.await_args_list[1].args[1]
+    assert mark_params == [{"entry_id": entry_id, "seen_at": enqueued_at} for entry_id in (1, 2, 3)]
+
+
+@pytest.mark.asyncio
+async def test_upsert_comments_batched_embeds_chunks_across_comments() -> None:
+    issue = MagicMock(number=1, repo="repo", owner="owner", url="", title="t", state="open")
+    issue.created_at = issue.updated_at = None
+    comments = []
+    for comment_id, body in [(1, "alpha " * 300), (2, "beta"), (3, "gamma " * 250)]:
+        comment = MagicMock(comment_id=comment_id, body=body, author="octocat")
+        comment.created_at = comment.updated_at = None
+        comments.append((comment, issue))
+
+    qdrant = MagicMock(chunker=word_chunker(max_tokens=200))
+    # Vectors encode their chunk, so the test can check they reach the matching payload
+    qdrant.dense_vectors = AsyncMock(side_effect=lambda texts: [[float(len(text))] for text in texts])
+    qdrant.sparse_vectors = AsyncMock(side_effect=lambda texts: [{"indices": [0], "values": [1.0]} for _ in texts])
+    qdrant.client.upsert = AsyncMock()
+    qdrant.client.delete = AsyncMock()
+
+    stored = await upsert_comments_batched(qdrant, comments, embed_batch_size=3)
+
+    assert stored == {1, 2, 3}
+    # 2 + 1 + 2 chunks share two model calls instead of five
+    assert [len(call.args[0]) for call in qdrant.dense_vectors.await_args_list] == [3, 2]
+    for call in qdrant.client.upsert.await_args_list:
+        batch = call.kwargs["points"]
+        assert [[float(len(payload["chunk_text"]))] for payload in batch.payloads] == batch.vectors["dense"]
+        assert batch.ids == [chunk_point_id(p["comment_id"], p["chunk_index"]) for p in batch.payloads]
+    # First chunks, which carry the hash later runs compare against, are written last
+    last_batch = qdrant.client.upsert.await_args_list[-1].kwargs["points"]
+    assert {payload["chunk_index"] for payload in last_batch.payloads} == {0}
+
+
+@pytest.mark.asyncio
+async def test_upsert_comments_batched_reports_failed_comments() -> None:
+    issue = MagicMock(number=1, repo="repo", owner="owner", url="", title="t", state="open")
+    issue.created_at = issue.updated_at = None
+    comment = MagicMock(comment_id=9, body="text", author="octocat")
+    comment.created_at = comment.updated_at = None
+
+    qdrant = MagicMock(chunker=word_chunker())
+    qdrant.dense_vectors = AsyncMock(return_value=[[0.1]])
+    qdrant.sparse_vectors = AsyncMock(return_value=[{"indices": [], "values": []}])
+    qdrant.client.upsert = AsyncMock(side_effect=RuntimeError("qdrant down"))
+    qdrant.client.delete = AsyncMock()
+
+    assert await upsert_comments_batched(qdrant, [(comment, issue)]) == set()
+    # Nothing was replaced, so the previous points are kept
+    qdrant.client.delete.assert_not_called()
+
+
+def test_point_ids_and_hashes_are_deterministic() -> None:
+    assert chunk_point_id(456, 0) == chunk_point_id(456, 0)
+    assert chunk_point_id(456, 0) != chunk_point_id(456, 1)
+    assert content_hash("body") == content_hash("body") != content_hash("edited body")
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from src.vectorstore.embedding_cache import EmbeddingCache
+
+
+def test_round_trip_and_counters(tmp_path: Path) -> None:
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    try:
+        assert cache.get_many("dense", ["a", "b"]) == [None, None]
+        cache.put_many("dense", [("a", b"vec-a")])
+
+        assert cache.get_many("dense", ["a", "b"]) == [b"vec-a", None]
+        # Entries are scoped to the model that produced them
+        assert cache.get_many("sparse", ["a"]) == [None]
+        assert cache.stats() == {"hits": 1, "misses": 4, "hit_rate": 0.2}
+    finally:
+        cache.close()
+
+
+def test_entries_persist_across_instances(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EmbeddingCache(path)
+    cache.put_many("dense", [("a", b"vec-a")])
+    cache.close()
+
+    reopened = EmbeddingCache(path)
+    try:
+        assert reopened.get_many("dense", ["a"]) == [b"vec-a"]
+        assert reopened.count == 1
+    finally:
+        reopened.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path) -> None:
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    try:
+        cache.put_many("dense", [("a", b"1")])
+        cache.put_many("dense", [("b", b"2")])
+        # Reading "a" makes "b" the least recently used entry
+        cache.get_many("dense", ["a"])
+        cache.put_many("dense", [("c", b"3")])
+
+        assert cache.get_many("dense", ["a", "b", "c"]) == [b"1", None, b"3"]
+        # Storing a cached text again adds no row, so nothing more is evicted
+        cache.put_many("dense", [("c", b"3")])
+        assert cache.count == 2
+        assert cache.get_many("dense", ["a", "c"]) == [b"1", b"3"]
+    finally:
+        cache.close()
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from sqlalchemy.dialects import postgresql
+
+from src.data_pipeline.benchmark_collector import BenchmarkCollector, delete_benchmark_rows, run_benchmark
+from src.data_pipeline.fake_github import FakeGitHubData, FakeGitHubServer
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+
+
+def test_collector_pages_through_fake_server() -> None:
+    data = FakeGitHubData.synthetic("bench", "fake", num_issues=25, comments_per_issue=2)
+    with FakeGitHubServer(data) as server:
+        collector = GitHubIssuesCollector(db=MagicMock(), base_url=server.url)
+        collector.pace = MagicMock()  # type: ignore[method-assign]
+
+        issues = collector.get_issues("bench", "fake", per_page=10, max_pages=5)
+        comments = collector.get_repo_comments("bench", "fake")
+
+    assert len(issues) == 25
+    assert sum(len(c) for c in comments.values()) == 50
+    # Three full or partial issue pages, one empty page, one comments page
+    assert server.request_count == 5
+
+
+def test_fake_server_answers_matching_etag_with_304_and_enforces_quota() -> None:
+    data = FakeGitHubData.synthetic("bench", "fake", num_issues=3, comments_per_issue=0)
+    with FakeGitHubServer(data, rate_limit=1) as server:
+        url = f"{server.url}/repos/bench/fake/issues"
+        first = requests.get(url)
+        cached = requests.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        limited = requests.get(url, params={"page": "2"})
+
+    assert first.status_code == 200
+    assert first.headers["X-RateLimit-Remaining"] == "0"
+    assert cached.status_code == 304
+    assert limited.status_code == 403
+
+
+def test_run_benchmark_without_db_reports_requests_per_issue() -> None:
+    data = FakeGitHubData.synthetic("bench", "fake", num_issues=10, comments_per_issue=1)
+    with FakeGitHubServer(data) as server:
+        [result] = run_benchmark(server, MagicMock(), write_db=False, per_page=5, bulk_comments=True)
+
+    assert result.issues == 10
+    assert result.requests == 4
+    assert result.requests_per_issue == 0.4
+
+
+@patch("src.data_pipeline.benchmark_collector.delete_benchmark_rows")
+def test_run_benchmark_deletes_written_rows_even_when_a_run_fails(mock_delete: MagicMock) -> None:
+    db = MagicMock()
+    data = FakeGitHubData.synthetic("bench", "fake", num_issues=2, comments_per_issue=0)
+    with (
+        FakeGitHubServer(data) as server,
+        patch.object(BenchmarkCollector, "sync_repo", side_effect=RuntimeError("boom")),
+        pytest.raises(RuntimeError),
+    ):
+        run_benchmark(server, db, write_db=True)
+
+    mock_delete.assert_called_once_with(db)
+
+
+def test_delete_benchmark_rows_only_touches_the_fake_repository() -> None:
+    db = MagicMock()
+    session = db.session_scope.return_value.__enter__.return_value
+
+    delete_benchmark_rows(db)
+
+    statements = [call.args[0].compile(dialect=postgresql.dialect()) for call in session.execute.call_args_list]
+    assert [str(statement).split()[2] for statement in statements] == ["comments", "issues", "sync_state"]
+    assert all(set(statement.params.values()) == {"bench", "fake"} for statement in statements)
@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.data_pipeline.fast_decode import decode_comment, decode_issue, loads, to_payload
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.models.github_models import GitHubComment, GitHubIssue
+
+RAW_ISSUE = {
+    "number": 7,
+    "title": "Crash on start",
+    "body": None,
+    "state": "open",
+    "user": {"login": "octocat", "id": 1},
+    "html_url": "https://github.com/owner/repo/issues/7",
+    "created_at": "2025-01-01T00:00:00Z",
+    "updated_at": "2025-01-02T00:00:00Z",
+    "labels": [{"name": "bug", "color": "red"}],
+    "comments": 2,
+    "reactions": {"+1": 3},
+}
+RAW_COMMENT = {
+    "id": 70,
+    "user": {"login": "octocat"},
+    "body": "Same here",
+    "created_at": "2025-01-01T00:00:00Z",
+    "updated_at": None,
+    "issue_url": "https://api.github.com/repos/owner/repo/issues/7",
+}
+
+
+def test_fast_models_match_pydantic_models() -> None:
+    assert to_payload(decode_issue(RAW_ISSUE)) == GitHubIssue(**RAW_ISSUE).model_dump()
+    assert to_payload(decode_comment(RAW_COMMENT)) == GitHubComment(**RAW_COMMENT).model_dump()
+
+
+@pytest.mark.parametrize("missing", ["title", "body", "user"])
+def test_fast_decoder_rejects_what_pydantic_rejects(missing: str) -> None:
+    raw = {key: value for key, value in RAW_ISSUE.items() if key != missing}
+
+    with pytest.raises(ValueError):
+        decode_issue(raw)
+    with pytest.raises(ValueError):
+        GitHubIssue(**raw)
+
+
+def test_collector_fast_path_parses_same_issues() -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    raw = loads(b'[{"pull_request": {}}]')
+    raw.append(RAW_ISSUE)
+
+    slow = collector.parse_issues(raw)
+    collector.fast_decode = True
+    fast = collector.parse_issues(raw)
+
+    assert [to_payload(issue) for issue in fast] == [to_payload(issue) for issue in slow]
+    assert collector.label_flags(fast[0]) == collector.label_flags(slow[0])
+    assert collector.issue_values(fast[0], "owner", "repo") == collector.issue_values(slow[0], "owner", "repo")
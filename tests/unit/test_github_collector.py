@@ -0,0 +1,221 @@
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.models.db_models import SyncCheckpoint
+from src.models.github_models import GitHubIssue
+
+
+def test_issue_list_params_use_updated_sort_with_watermark() -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+
+    params = collector.issue_list_params("all", None, 100, 1, since=datetime(2025, 1, 2, 3, 4, 5))
+
+    assert params["sort"] == "updated"
+    assert params["direction"] == "asc"
+    assert params["since"] == "2025-01-02T03:04:05Z"
+    assert collector.issue_list_params("all", None, 100, 1)["sort"] == "created"
+
+
+def test_next_watermark_is_newest_update_seen(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    since = datetime(2025, 1, 1)
+    started_at = datetime(2025, 6, 1)
+    issues = [make_issue(1, "2025-02-01T00:00:00Z"), make_issue(2, "2025-03-01T00:00:00Z")]
+
+    assert collector.next_watermark(issues, since, started_at) == datetime(2025, 3, 1)
+    assert collector.next_watermark([], since, started_at) == since
+    assert collector.next_watermark(issues, None, started_at) == started_at
+
+
+def test_incremental_pages_advance_since_instead_of_page_number(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    pages = [
+        [make_issue(1, "2025-02-01T00:00:00Z"), make_issue(2, "2025-03-01T00:00:00Z")],
+        [make_issue(2, "2025-03-01T00:00:00Z"), make_issue(3, "2025-04-01T00:00:00Z")],
+        [make_issue(3, "2025-04-01T00:00:00Z")],
+    ]
+    responses = []
+    for page in pages:
+        response = MagicMock(status_code=200, headers={"X-RateLimit-Remaining": "5000"})
+        response.json.return_value = [issue.model_dump(mode="json") for issue in page]
+        responses.append(response)
+
+    with patch.object(collector.http, "request", side_effect=responses) as mock_request, patch("time.sleep"):
+        yielded = list(collector.iter_issue_pages("owner", "repo", per_page=2, max_pages=5, since=datetime(2025, 1, 1)))
+
+    sent = [(c.kwargs["params"]["since"], c.kwargs["params"]["page"]) for c in mock_request.call_args_list]
+    assert sent == [("2025-01-01T00:00:00Z", "1"), ("2025-03-01T00:00:00Z", "1"), ("2025-04-01T00:00:00Z", "1")]
+    assert [(page, cursor) for page, cursor, _ in yielded] == [
+        (0, datetime(2025, 3, 1)),
+        (0, datetime(2025, 4, 1)),
+        # The last page did not move past its own `since`, so a resume continues with page 2
+        (1, datetime(2025, 4, 1)),
+    ]
+
+
+def test_unchanged_short_page_ends_the_listing() -> None:
+    cache = MagicMock()
+    cache.conditional_headers.return_value = {"If-None-Match": "etag"}
+    cache.get.return_value = {"etag": "etag", "item_count": 3}
+    collector = GitHubIssuesCollector(db=MagicMock(), cache=cache)
+    not_modified = MagicMock(status_code=304, headers={"X-RateLimit-Remaining": "5000"})
+
+    with patch.object(collector.http, "request", return_value=not_modified) as mock_request:
+        yielded = list(collector.iter_issue_pages("owner", "repo", per_page=100, max_pages=5))
+
+    assert [(page, issues) for page, _, issues in yielded] == [(1, [])]
+    mock_request.assert_called_once()
+
+
+def test_pages_sharing_one_update_time_fall_back_to_page_numbers() -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    raw_issues = [{"updated_at": "2025-01-01T00:00:00Z"}] * 2
+
+    assert collector.next_list_position(datetime(2025, 1, 1), 1, raw_issues) == (datetime(2025, 1, 1), 2)
+
+
+def test_sync_repo_commits_each_page_and_stops_on_failure(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    run = SyncCheckpoint(page=0, since=datetime(2025, 1, 1), started_at=datetime(2025, 6, 1))
+    pages = [
+        (0, datetime(2025, 2, 1), [make_issue(1, "2025-02-01T00:00:00Z")]),
+        (0, datetime(2025, 3, 1), [make_issue(2, "2025-03-01T00:00:00Z")]),
+    ]
+
+    with (
+        patch.object(collector, "start_sync", return_value=run),
+        patch.object(collector, "iter_issue_pages", return_value=iter(pages)) as mock_pages,
+        patch.object(collector, "save_issues_to_db", side_effect=[True, False]) as mock_save,
+        patch.object(collector, "commit_watermark") as mock_commit_watermark,
+    ):
+        collector.sync_repo("owner", "repo")
+
+    assert mock_pages.call_args.kwargs["since"] == datetime(2025, 1, 1)
+    # Incremental runs checkpoint the update time to list from next, not a page number
+    assert [c.kwargs["checkpoint"].cursor for c in mock_save.call_args_list] == [
+        "2025-02-01T00:00:00",
+        "2025-03-01T00:00:00",
+    ]
+    mock_commit_watermark.assert_not_called()
+
+
+def test_sync_repo_resumes_from_checkpoint(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    checkpoint = SyncCheckpoint(
+        page=0, cursor="2025-01-15T00:00:00", since=datetime(2025, 1, 1), started_at=datetime(2025, 6, 1), mode="rest"
+    )
+
+    with (
+        patch.object(collector, "load_checkpoint", return_value=checkpoint),
+        patch.object(collector, "resolve_watermark") as mock_resolve_watermark,
+        patch.object(
+            collector,
+            "iter_issue_pages",
+            return_value=iter([(0, datetime(2025, 2, 1), [make_issue(1, "2025-02-01T00:00:00Z")])]),
+        ) as mock_pages,
+        patch.object(collector, "save_issues_to_db", return_value=True),
+        patch.object(collector, "commit_watermark") as mock_commit_watermark,
+    ):
+        collector.sync_repo("owner", "repo")
+
+    mock_resolve_watermark.assert_not_called()
+    assert mock_pages.call_args.kwargs["cursor"] == datetime(2025, 1, 15)
+    assert mock_pages.call_args.kwargs["since"] == datetime(2025, 1, 1)
+    mock_commit_watermark.assert_called_once_with("owner", "repo", datetime(2025, 2, 1))
+
+
+def test_start_sync_ignores_a_checkpoint_left_by_graphql() -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    checkpoint = SyncCheckpoint(
+        page=3, cursor="Y3Vyc29yOnYyOpK5", since=datetime(2025, 1, 1), started_at=datetime(2025, 6, 1), mode="graphql"
+    )
+
+    with patch.object(collector, "load_checkpoint", return_value=checkpoint):
+        run = collector.start_sync("owner", "repo", full_backfill=False)
+
+    # The window of the interrupted run is listed again from its start
+    assert run == SyncCheckpoint(page=0, since=datetime(2025, 1, 1), started_at=datetime(2025, 6, 1), mode="rest")
+
+
+def test_get_repo_comments_groups_by_issue_number(comment_payload: Callable[..., dict[str, Any]]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    raw_comments = [comment_payload(comment_id, number) for comment_id, number in [(1, 10), (2, 10), (3, 11)]]
+    response = MagicMock(status_code=200, headers={"X-RateLimit-Remaining": "5000"})
+    response.json.return_value = raw_comments
+
+    with patch.object(collector.http, "request", return_value=response) as mock_get:
+        grouped = collector.get_repo_comments("owner", "repo", since=datetime(2025, 1, 1))
+
+    assert mock_get.call_count == 1
+    assert mock_get.call_args.kwargs["params"]["since"] == "2025-01-01T00:00:00Z"
+    assert {number: [c.id for c in comments] for number, comments in grouped.items()} == {10: [1, 2], 11: [3]}
+
+
+def test_get_repo_comments_pages_by_since_and_drops_relisted_comments(
+    comment_payload: Callable[..., dict[str, Any]],
+) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+
+    def raw_comment(comment_id: int, day: int) -> dict[str, Any]:
+        return comment_payload(comment_id, 10, updated_at=f"2025-02-{day:02d}T00:00:00Z")
+
+    full_page = MagicMock(status_code=200, headers={"X-RateLimit-Remaining": "5000"})
+    full_page.json.return_value = [raw_comment(i, 1) for i in range(99)] + [raw_comment(99, 2)]
+    # Listing from the newest update seen starts with the comment updated at that instant again
+    last_page = MagicMock(status_code=200, headers={"X-RateLimit-Remaining": "5000"})
+    last_page.json.return_value = [raw_comment(99, 2), raw_comment(100, 3)]
+
+    with patch.object(collector.http, "request", side_effect=[full_page, last_page]) as mock_get:
+        grouped = collector.get_repo_comments("owner", "repo", since=datetime(2025, 1, 1))
+
+    sent = [(c.kwargs["params"]["since"], c.kwargs["params"]["page"]) for c in mock_get.call_args_list]
+    assert sent == [("2025-01-01T00:00:00Z", "1"), ("2025-02-02T00:00:00Z", "1")]
+    assert [c.id for c in grouped[10]] == list(range(101))
+
+
+def test_sync_repo_keeps_the_watermark_when_the_comment_walk_fails(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    run = SyncCheckpoint(page=0, since=datetime(2025, 1, 1), started_at=datetime(2025, 6, 1))
+
+    with (
+        patch.object(collector, "start_sync", return_value=run),
+        patch.object(
+            collector,
+            "iter_issue_pages",
+            return_value=iter([(0, datetime(2025, 2, 1), [make_issue(1, "2025-02-01T00:00:00Z")])]),
+        ),
+        patch.object(collector, "save_issues_to_db", return_value=True) as mock_save,
+        patch.object(collector, "get_repo_comments", side_effect=requests.ConnectionError("reset")),
+        patch.object(collector, "commit_watermark") as mock_commit_watermark,
+    ):
+        collector.sync_repo("owner", "repo", bulk_comments=True)
+
+    # Only the issue page was saved; the partial comment walk is neither saved nor covered by the watermark
+    mock_save.assert_called_once()
+    mock_commit_watermark.assert_not_called()
+
+
+def test_needs_comment_fetch_compares_count_and_newest_stored_comment(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock())
+    issue = make_issue(1, "2025-02-01T00:00:00Z")
+    stored = {1: (3, datetime(2025, 2, 1))}
+
+    with patch("src.data_pipeline.ingestion_raw_data.fetch_comment_stats", return_value=stored):
+        assert collector.needs_comment_fetch(MagicMock(), issue, 1)
+
+        issue.comments = 0
+        assert not collector.needs_comment_fetch(MagicMock(), issue, 1)
+        issue.comments = 3
+        assert not collector.needs_comment_fetch(MagicMock(), issue, 1)
+        issue.comments = 4
+        assert collector.needs_comment_fetch(MagicMock(), issue, 1)
+
+        # Same count, but the issue changed after its newest stored comment: an edit, or a deletion plus an addition
+        issue.comments = 3
+        issue.updated_at = "2025-02-02T00:00:00Z"
+        assert collector.needs_comment_fetch(MagicMock(), issue, 1)
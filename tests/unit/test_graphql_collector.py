@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.data_pipeline.graphql_ingestion import MAX_PAGE_SIZE, MIN_PAGE_SIZE, GitHubGraphQLCollector
+
+
+def make_node(number: int, comment_id: int | None = None) -> dict:
+    return {
+        "number": number,
+        "title": f"Issue {number}",
+        "body": "body",
+        "state": "OPEN",
+        "url": f"https://github.com/owner/repo/issues/{number}",
+        "createdAt": "2025-01-01T00:00:00Z",
+        "updatedAt": "2025-01-02T00:00:00Z",
+        "author": None,
+        "labels": {"nodes": [{"name": "Bug"}]},
+        "comments": {
+            "totalCount": 1,
+            "nodes": [
+                {
+                    "fullDatabaseId": str(comment_id or number * 100),
+                    "body": "comment",
+                    "createdAt": "2025-01-01T00:00:00Z",
+                    "updatedAt": "2025-01-01T00:00:00Z",
+                    "author": {"login": "octocat"},
+                }
+            ],
+        },
+    }
+
+
+def make_response(nodes: list[dict], has_next_page: bool, cost: int) -> MagicMock:
+    response = MagicMock(status_code=200)
+    response.json.return_value = {
+        "data": {
+            "rateLimit": {"cost": cost, "remaining": 5000, "resetAt": "2025-01-01T01:00:00Z"},
+            "repository": {"issues": {"pageInfo": {"hasNextPage": has_next_page, "endCursor": "cursor"}, "nodes": nodes}},
+        }
+    }
+    return response
+
+
+def test_next_page_size_follows_query_cost() -> None:
+    collector = GitHubGraphQLCollector(db=MagicMock(), token="token", max_query_cost=10)
+
+    assert collector.next_page_size(50, 20) == 25
+    assert collector.next_page_size(50, 1) == MAX_PAGE_SIZE
+    assert collector.next_page_size(10, 1000) == MIN_PAGE_SIZE
+
+
+def test_fetch_issues_with_comments_paginates_and_nests_comments() -> None:
+    collector = GitHubGraphQLCollector(db=MagicMock(), token="token", page_size=50, max_query_cost=10)
+    responses = [make_response([make_node(1)], True, cost=20), make_response([make_node(2)], False, cost=5)]
+
+    with patch.object(collector.http, "request", side_effect=responses) as mock_post:
+        issues, comments_by_issue = collector.fetch_issues_with_comments("owner", "repo", max_pages=5)
+
+    assert [issue.number for issue in issues] == [1, 2]
+    assert issues[0].user.login == "ghost"
+    assert issues[0].state == "open"
+    assert [c.id for c in comments_by_issue[2]] == [200]
+    # The second query was shrunk because the first one cost twice the budget
+    assert mock_post.call_args_list[1].kwargs["json"]["variables"]["pageSize"] == 25
+    assert mock_post.call_args_list[1].kwargs["json"]["variables"]["cursor"] == "cursor"
+
+
+def test_parse_issue_node_reads_comment_ids_beyond_32_bits() -> None:
+    collector = GitHubGraphQLCollector(db=MagicMock(), token="token")
+
+    _, comments = collector.parse_issue_node(make_node(1, comment_id=2**31 + 5))
+
+    assert [comment.id for comment in comments] == [2**31 + 5]
+
+
+def test_only_query_timeouts_shrink_the_page() -> None:
+    collector = GitHubGraphQLCollector(db=MagicMock(), token="token", page_size=40)
+    gateway_timeout = MagicMock(status_code=504)
+    gateway_timeout.raise_for_status.side_effect = requests.HTTPError(response=gateway_timeout)
+    forbidden = MagicMock(status_code=403)
+    forbidden.raise_for_status.side_effect = requests.HTTPError(response=forbidden)
+
+    with (
+        patch.object(collector.http, "request", side_effect=[gateway_timeout, forbidden]) as mock_post,
+        pytest.raises(requests.HTTPError),
+    ):
+        list(collector.iter_graphql_pages("owner", "repo"))
+
+    # The 504 is retried with half the page; the 403 is raised without another attempt
+    assert [c.kwargs["json"]["variables"]["pageSize"] for c in mock_post.call_args_list] == [40, 20]
+
+
+@patch("src.data_pipeline.graphql_ingestion.time.sleep")
+def test_wait_for_budget_leaves_pacing_to_the_governor(mock_sleep: MagicMock) -> None:
+    rate_limit = {"cost": 1, "remaining": 0, "resetAt": "2999-01-01T00:00:00Z"}
+
+    GitHubGraphQLCollector(db=MagicMock(), token="token", governor=MagicMock()).wait_for_budget(rate_limit)
+    mock_sleep.assert_not_called()
+
+    GitHubGraphQLCollector(db=MagicMock(), token="token").wait_for_budget(rate_limit)
+    mock_sleep.assert_called_once()
@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from src.data_pipeline.http_cache import ConditionalRequestCache
+
+URL = "https://api.github.com/repos/owner/repo/issues"
+
+
+def test_validators_are_persisted_only_after_save(tmp_path: Path) -> None:
+    cache_path = tmp_path / "http_cache.json"
+    cache = ConditionalRequestCache(str(cache_path))
+
+    cache.store(URL, {"page": "1"}, {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2025 00:00:00 GMT"}, item_count=100)
+    assert not cache_path.exists()
+
+    cache.save()
+    reloaded = ConditionalRequestCache(str(cache_path))
+
+    assert reloaded.conditional_headers(URL, {"page": "1"}) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 01 Jan 2025 00:00:00 GMT",
+    }
+    assert reloaded.conditional_headers(URL, {"page": "2"}) == {}
+
+
+def test_discard_drops_pending_validators(tmp_path: Path) -> None:
+    cache = ConditionalRequestCache(str(tmp_path / "http_cache.json"))
+
+    cache.store(URL, {"page": "1"}, {"ETag": '"abc"'}, item_count=10)
+    cache.discard()
+    cache.save()
+
+    assert cache.conditional_headers(URL, {"page": "1"}) == {}
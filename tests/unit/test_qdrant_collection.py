@@ -1,7 +1,31 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
+from src.vectorstore.embedding_cache import EmbeddingCache
+from src.vectorstore.qdrant_store import AsyncQdrantVectorStore
+
+
+@patch("src.vectorstore.qdrant_store.AsyncQdrantClient", autospec=True)
+@patch("src.vectorstore.qdrant_store.SparseTextEmbedding", autospec=True)
+@patch("src.vectorstore.qdrant_store.TextEmbedding", autospec=True)
+def test_constructor_sizes_chunks_with_the_dense_tokenizer(
+    mock_dense_cls: MagicMock, mock_sparse_cls: MagicMock, mock_client_cls: MagicMock
+) -> None:
+    # Autospec follows the installed fastembed, so a missing `token_count` fails here
+    mock_dense_cls.return_value.token_count.side_effect = lambda text: len(text.split()) + 2
+
+    vectorstore = AsyncQdrantVectorStore()
+    try:
+        assert vectorstore.chunker.special_tokens == 2
+        assert vectorstore.chunker.split("one two") == ["one two"]
+    finally:
+        vectorstore.close()
+
 
 @pytest.mark.asyncio
 @patch("src.vectorstore.qdrant_store.AsyncQdrantVectorStore", autospec=True)
@@ -25,3 +49,50 @@ async def test_delete_collection_called(MockVectorStore: MagicMock) -> None:
     await vectorstore.delete_collection()
 
     mock_instance.delete_collection.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_embeddings_run_on_the_executor_threads() -> None:
+    threads = []
+
+    def embed(texts: list[str], batch_size: int) -> list[np.ndarray]:
+        threads.append(threading.current_thread().name)
+        return [np.array([0.5]) for _ in texts]
+
+    vectorstore = AsyncQdrantVectorStore.__new__(AsyncQdrantVectorStore)
+    vectorstore.dense_model = MagicMock(embed=embed)
+    vectorstore.cache = None
+    vectorstore.embed_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="embed")
+    try:
+        assert await vectorstore.dense_vectors(["a", "b"]) == [[0.5], [0.5]]
+    finally:
+        vectorstore.close()
+
+    assert threads[0].startswith("embed")
+
+
+def test_cached_embeddings_are_not_recomputed(tmp_path: Path) -> None:
+    embedded = []
+
+    def embed(texts: list[str], batch_size: int) -> list[np.ndarray]:
+        embedded.extend(texts)
+        return [np.array([len(text), 0.5], dtype=np.float32) for text in texts]
+
+    def embed_sparse(texts: list[str], batch_size: int) -> list[MagicMock]:
+        return [MagicMock(indices=np.array([3, 7]), values=np.array([0.25, len(text)])) for text in texts]
+
+    vectorstore = AsyncQdrantVectorStore.__new__(AsyncQdrantVectorStore)
+    vectorstore.dense_model = MagicMock(embed=embed)
+    vectorstore.sparse_model = MagicMock(embed=embed_sparse)
+    vectorstore.cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    try:
+        assert vectorstore.embed_dense(["ab", "c"]) == [[2.0, 0.5], [1.0, 0.5]]
+        assert vectorstore.embed_dense(["c", "def", "ab"]) == [[1.0, 0.5], [3.0, 0.5], [2.0, 0.5]]
+        vectorstore.embed_sparse(["ab"])
+        sparse = vectorstore.embed_sparse(["ab"])
+    finally:
+        vectorstore.cache.close()
+
+    assert embedded == ["ab", "c", "def"]
+    assert sparse[0].indices == [3, 7]
+    assert sparse[0].values == [0.25, 2.0]
@@ -0,0 +1,98 @@
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.data_pipeline.rate_limit import FileRateLimitStore, RateLimitGovernor
+
+
+def make_governor(tmp_path: Path) -> RateLimitGovernor:
+    return RateLimitGovernor(FileRateLimitStore(str(tmp_path / "rate_limit.json")), margin=0)
+
+
+def test_reserve_spreads_remaining_budget_until_reset(tmp_path: Path) -> None:
+    governor = make_governor(tmp_path)
+    governor.record("key", {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(time.time() + 100)})
+
+    first = governor.reserve("key")
+    second = governor.reserve("key")
+
+    assert first < 1
+    assert 9 < second - first < 11
+
+
+def test_reserve_runs_at_full_speed_while_the_budget_lasts(tmp_path: Path) -> None:
+    governor = make_governor(tmp_path)
+    # 200 requests in the first 10 minutes of the window leave plenty of the 4999 for the rest
+    reset = str(time.time() + 3000)
+    governor.record("key", {"X-RateLimit-Remaining": "4999", "X-RateLimit-Used": "200", "X-RateLimit-Reset": reset})
+
+    assert [governor.reserve("key") for _ in range(5)] == [0, 0, 0, 0, 0]
+
+
+def test_reserve_paces_once_the_rate_would_drain_the_budget(tmp_path: Path) -> None:
+    governor = make_governor(tmp_path)
+    # 4000 requests in 10 minutes would run out of the last 1000 long before the reset
+    reset = str(time.time() + 3000)
+    governor.record("key", {"X-RateLimit-Remaining": "1000", "X-RateLimit-Used": "4000", "X-RateLimit-Reset": reset})
+
+    first = governor.reserve("key")
+    second = governor.reserve("key")
+
+    assert first < 1
+    assert 2.5 < second - first < 3.5
+
+
+def test_budget_is_shared_between_governors_on_the_same_store(tmp_path: Path) -> None:
+    governor = make_governor(tmp_path)
+    other = make_governor(tmp_path)
+    governor.record("key", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(time.time() + 60)})
+
+    assert other.reserve("key") > 55
+    assert other.reserve("anonymous") == 0
+
+
+def test_backoff_honors_retry_after(tmp_path: Path) -> None:
+    governor = make_governor(tmp_path)
+
+    assert governor.backoff("key", {"Retry-After": "30"}, attempt=0) == 30
+    assert governor.reserve("key") > 29
+
+
+def test_is_rate_limited_ignores_permission_errors() -> None:
+    assert RateLimitGovernor.is_rate_limited(429, {})
+    assert RateLimitGovernor.is_rate_limited(403, {}, "You have exceeded a secondary rate limit")
+    assert not RateLimitGovernor.is_rate_limited(403, {}, "Resource not accessible by integration")
+
+
+def test_request_retries_after_secondary_rate_limit(tmp_path: Path) -> None:
+    governor = MagicMock(wraps=make_governor(tmp_path))
+    governor.is_rate_limited = RateLimitGovernor.is_rate_limited
+    governor.backoff.return_value = 0
+    collector = GitHubIssuesCollector(db=MagicMock(), governor=governor)
+    limited = MagicMock(status_code=429, headers={}, text="")
+    ok = MagicMock(status_code=200, headers={}, text="[]")
+
+    with patch.object(collector.http, "request", side_effect=[limited, ok]) as mock_request:
+        response = collector.request("GET", "https://api.github.com/repos/o/r/issues")
+
+    assert response is ok
+    assert mock_request.call_count == 2
+    governor.backoff.assert_called_once()
+
+
+def test_graphql_and_rest_budgets_are_recorded_separately(tmp_path: Path) -> None:
+    governor = MagicMock(wraps=make_governor(tmp_path))
+    governor.is_rate_limited = RateLimitGovernor.is_rate_limited
+    collector = GitHubIssuesCollector(db=MagicMock(), token="token", governor=governor)
+    rest = MagicMock(status_code=200, headers={"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4000"})
+    graphql = MagicMock(status_code=200, headers={"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "10"})
+
+    with patch.object(collector.http, "request", side_effect=[rest, graphql]):
+        collector.request("GET", "https://api.github.com/repos/o/r/issues")
+        collector.request("POST", "https://api.github.com/graphql", json={})
+
+    reserved = [c.args[0] for c in governor.reserve.call_args_list]
+    recorded = [c.args[0] for c in governor.record.call_args_list]
+    assert reserved == recorded == [RateLimitGovernor.key_for("token"), RateLimitGovernor.key_for("token", "graphql")]
+    assert reserved[0] != reserved[1]
@@ -0,0 +1,63 @@
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.data_pipeline.raw_archive import RawPayloadArchive
+from src.data_pipeline.replay_raw_data import replay_repository
+
+
+def test_archive_keeps_newest_payloads_across_appends(
+    tmp_path: Path, issue_payload: Callable[..., dict[str, Any]], comment_payload: Callable[..., dict[str, Any]]
+) -> None:
+    archive = RawPayloadArchive(str(tmp_path))
+    archive.write("owner", "repo", "issues", [issue_payload(1, "2025-01-02T00:00:00Z")])
+    archive.write(
+        "owner",
+        "repo",
+        "issues",
+        [issue_payload(1, "2025-01-03T00:00:00Z", labels=[{"name": "bug"}]), issue_payload(2, "x")],
+    )
+    archive.write("owner", "repo", "comments", [comment_payload(10, 1)])
+
+    latest = archive.latest_issues("owner", "repo")
+
+    assert archive.repositories() == [("owner", "repo")]
+    assert latest[1]["labels"] == [{"name": "bug"}]
+    assert set(latest) == {1, 2}
+    assert list(archive.latest_comments("owner", "repo")) == [1]
+
+
+def test_replay_saves_archived_issues_with_their_comments_and_no_requests(
+    tmp_path: Path, issue_payload: Callable[..., dict[str, Any]], comment_payload: Callable[..., dict[str, Any]]
+) -> None:
+    archive = RawPayloadArchive(str(tmp_path))
+    archive.write("owner", "repo", "issues", [issue_payload(1, "2025-01-02T00:00:00Z"), issue_payload(2, "x")])
+    archive.write("owner", "repo", "comments", [comment_payload(10, 1)], issue_number=1)
+    collector = GitHubIssuesCollector(db=MagicMock())
+
+    with (
+        patch.object(collector, "save_issues_to_db", return_value=True) as mock_save,
+        patch.object(collector.http, "request") as mock_request,
+    ):
+        assert replay_repository(collector, archive, "owner", "repo", chunk_size=1) == 2
+
+    assert mock_save.call_count == 2
+    first_comments = mock_save.call_args_list[0].args[3]
+    assert [comment.id for comment in first_comments[1]] == [10]
+    mock_request.assert_not_called()
+
+
+def test_collector_archives_raw_issue_pages(tmp_path: Path, issue_payload: Callable[..., dict[str, Any]]) -> None:
+    archive = RawPayloadArchive(str(tmp_path))
+    collector = GitHubIssuesCollector(db=MagicMock(), archive=archive)
+    response = MagicMock(status_code=200, headers={})
+    response.json.return_value = [issue_payload(1, "2025-01-02T00:00:00Z"), {**issue_payload(2, "x"), "pull_request": {}}]
+
+    with patch.object(collector.http, "request", return_value=response), patch("time.sleep"):
+        pages = list(collector.iter_issue_pages("owner", "repo", max_pages=1))
+
+    assert [issue.number for issue in pages[0][2]] == [1]
+    # Raw pages are archived untouched, pull requests included
+    assert sorted(archive.latest_issues("owner", "repo")) == [1, 2]
@@ -0,0 +1,72 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import create_engine
+
+from src.database.session import (
+    DB,
+    AsyncDB,
+    _secret_cache,
+    get_db_credentials_from_aws,
+    refresh_credentials_on_auth_failure,
+)
+from src.models.db_models import DBConfig
+from src.utils.config import settings
+
+CONFIG = DBConfig(username="user", password="secret", host="localhost", port=5432, dbname="github_issues")
+
+
+def test_sync_engine_uses_configured_pool() -> None:
+    db = DB(CONFIG)
+
+    assert db.engine is not None
+    assert db.engine.echo is settings.DB_ECHO
+    assert db.engine.pool.size() == settings.DB_POOL_SIZE  # type: ignore[attr-defined]
+
+
+def test_async_engine_uses_asyncpg_driver() -> None:
+    async_db = AsyncDB(CONFIG)
+
+    assert async_db.engine.url.drivername == "postgresql+asyncpg"
+    assert async_db.engine.url.database == "github_issues"
+    assert async_db.engine.pool.size() == settings.DB_POOL_SIZE  # type: ignore[attr-defined]
+
+
+def test_engine_is_created_on_first_use() -> None:
+    with patch("src.database.session.create_engine") as mock_create_engine:
+        db = DB(CONFIG)
+        mock_create_engine.assert_not_called()
+
+        assert db.engine is mock_create_engine.return_value
+        assert db.engine is mock_create_engine.return_value
+    mock_create_engine.assert_called_once()
+
+
+def test_aws_secret_is_cached_until_refreshed() -> None:
+    secret = {"SecretString": json.dumps({"username": "app", "password": "v1"})}
+    with patch.dict(_secret_cache, clear=True), patch("src.database.session.boto3.client") as mock_client:
+        mock_client.return_value.get_secret_value.return_value = secret
+
+        first = get_db_credentials_from_aws("db-secret", "eu-central-1")
+        second = get_db_credentials_from_aws("db-secret", "eu-central-1")
+        get_db_credentials_from_aws("db-secret", "eu-central-1", force_refresh=True)
+
+    assert first == second == {"username": "app", "password": "v1"}
+    assert mock_client.return_value.get_secret_value.call_count == 2
+
+
+def test_connect_refetches_secret_after_auth_failure() -> None:
+    engine = create_engine(CONFIG.build_url())
+    refresh_credentials_on_auth_failure(engine)
+    auth_error = Exception('FATAL:  password authentication failed for user "app"')
+    dialect = MagicMock()
+    dialect.connect.side_effect = [auth_error, "connection"]
+    rotated = [{"username": "app", "password": "old"}, {"username": "app", "password": "new"}]
+
+    with patch("src.database.session.get_db_credentials_from_aws", side_effect=rotated) as mock_get:
+        cparams: dict = {}
+        connections = [listener(dialect, None, (), cparams) for listener in engine.dialect.dispatch.do_connect]
+
+    assert connections == ["connection"]
+    assert mock_get.call_args.kwargs == {"force_refresh": True}
+    assert dialect.connect.call_args.kwargs == {"user": "app", "password": "new"}
@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.database.text_search import MAX_QUERY_CHARS, lexical_search_statement, search_issues_lexical
+from src.models.db_models import Comment, Issue
+
+
+def test_lexical_search_ranks_comments_and_issues_by_any_term() -> None:
+    compiled = lexical_search_statement("ValueError in read_csv", limit=3).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "comments.search_vector @@" in sql
+    assert "issues.search_vector @@" in sql
+    assert "UNION ALL" in sql
+    assert "ORDER BY anon_1.score DESC" in sql
+    # The AND-ed terms of plainto_tsquery are turned into an OR query
+    assert "replace(CAST(plainto_tsquery(" in sql
+    assert (compiled.params["replace_2"], compiled.params["replace_3"]) == ("&", "|")
+
+
+def test_search_vectors_are_not_loaded_with_rows() -> None:
+    for model in (Issue, Comment):
+        assert "search_vector" not in str(select(model).compile(dialect=postgresql.dialect()))
+
+
+def test_lexical_search_truncates_long_queries() -> None:
+    compiled = lexical_search_statement("x" * (MAX_QUERY_CHARS + 10)).compile(dialect=postgresql.dialect())
+
+    assert len(compiled.params["plainto_tsquery_1"]) == MAX_QUERY_CHARS
+
+
+@pytest.mark.asyncio
+async def test_search_issues_lexical_returns_similar_issue_entries() -> None:
+    row = MagicMock(_mapping={"issue_number": 7, "comment_id": None, "score": 0.4})
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=[row])
+
+    assert await search_issues_lexical(session, "ValueError") == [{"issue_number": 7, "comment_id": None, "score": 0.4}]
@@ -0,0 +1,42 @@
+import pytest
+
+from src.data_pipeline.token_pool import GitHubTokenPool
+
+
+def test_acquire_prefers_token_with_most_remaining_quota() -> None:
+    pool = GitHubTokenPool(["a", "b"])
+
+    pool.update("a", {"X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "9999999999"})
+    pool.update("b", {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "9999999999"})
+
+    assert pool.acquire() == "b"
+    assert pool.remaining() == 10 + 3999
+
+
+def test_acquire_spreads_requests_before_any_response() -> None:
+    pool = GitHubTokenPool(["a", "b", "c"])
+
+    assert sorted(pool.acquire() for _ in range(3)) == ["a", "b", "c"]
+
+
+def test_quota_is_restored_after_reset() -> None:
+    pool = GitHubTokenPool(["a", "b"])
+    pool.update("a", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1"})
+    pool.update("b", {"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "9999999999"})
+
+    assert pool.acquire() == "a"
+
+
+def test_pool_requires_tokens() -> None:
+    with pytest.raises(ValueError):
+        GitHubTokenPool([])
+
+
+def test_graphql_quota_does_not_overwrite_rest_quota() -> None:
+    pool = GitHubTokenPool(["a", "b"])
+    pool.update("a", {"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "9999999999"})
+    pool.update("a", {"X-RateLimit-Resource": "graphql", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": "9999999999"})
+    pool.update("b", {"X-RateLimit-Resource": "core", "X-RateLimit-Remaining": "100", "X-RateLimit-Reset": "9999999999"})
+
+    assert pool.acquire() == "a"
+    assert pool.acquire("graphql") == "b"
@@ -0,0 +1,78 @@
+from collections.abc import Callable
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from src.data_pipeline.ingestion_raw_data import GitHubIssuesCollector
+from src.database.upserts import fetch_issue_versions, upsert_comments, upsert_issues
+from src.models.github_models import GitHubIssue
+
+
+def compiled_sql(session: MagicMock) -> str:
+    stmt = session.execute.call_args.args[0]
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_upsert_issues_only_updates_changed_rows() -> None:
+    session = MagicMock()
+    session.execute.return_value = [(1, 10)]
+
+    saved = upsert_issues(session, [{"number": 1, "owner": "o", "repo": "r", "title": "t", "updated_at": None}])
+
+    sql = compiled_sql(session)
+    assert saved == {1: 10}
+    assert "ON CONFLICT (owner, repo, number) DO UPDATE" in sql
+    assert "IS DISTINCT FROM excluded.updated_at" in sql
+    assert "RETURNING issues.number, issues.id" in sql
+
+
+def test_fetch_issue_versions_is_scoped_to_the_repository() -> None:
+    session = MagicMock()
+    session.execute.return_value = [(1, datetime(2025, 1, 1))]
+
+    assert fetch_issue_versions(session, "o", "r", [1]) == {1: datetime(2025, 1, 1)}
+
+    sql = compiled_sql(session)
+    assert "WHERE issues.owner = %(owner_1)s::VARCHAR AND issues.repo = %(repo_1)s::VARCHAR" in sql
+
+
+def test_upsert_comments_queues_written_comments_for_embedding() -> None:
+    session = MagicMock()
+    session.execute.return_value.scalars.return_value = [7, 5]
+
+    written = upsert_comments(session, [{"comment_id": 5, "issue_id": 1, "body": "b", "updated_at": None}])
+
+    assert written == 2
+    outbox_stmt = session.execute.call_args.args[0]
+    sql = str(outbox_stmt.compile(dialect=postgresql.dialect()))
+    assert "INSERT INTO embedding_outbox" in sql
+    assert "ON CONFLICT (comment_id) DO UPDATE SET enqueued_at = now(), processed_at" in sql
+    assert list(outbox_stmt.compile(dialect=postgresql.dialect()).params.values()) == [5, 7, None]
+
+
+def test_upsert_comments_skips_empty_batches() -> None:
+    session = MagicMock()
+
+    assert upsert_comments(session, []) == 0
+    session.execute.assert_not_called()
+
+
+def test_save_issue_page_bulk_skips_unchanged_issues(make_issue: Callable[..., GitHubIssue]) -> None:
+    collector = GitHubIssuesCollector(db=MagicMock(), bulk_upserts=True)
+    issues = [make_issue(1, "2025-02-01T00:00:00Z", comments=0), make_issue(2, "2025-03-01T00:00:00Z", comments=0)]
+
+    with (
+        patch(
+            "src.data_pipeline.ingestion_raw_data.fetch_issue_versions",
+            return_value={1: datetime(2025, 2, 1), 2: datetime(2025, 1, 1)},
+        ),
+        patch("src.data_pipeline.ingestion_raw_data.upsert_issues", return_value={2: 20}) as mock_upsert_issues,
+        patch("src.data_pipeline.ingestion_raw_data.fetch_comment_stats", return_value={}),
+        patch.object(collector, "get_issue_comments") as mock_get_comments,
+    ):
+        collector.save_issue_page_bulk(MagicMock(), issues, "owner", "repo")
+
+    # Issue 1 is unchanged and never sent; issue 2 has no comments so nothing is fetched
+    assert [row["number"] for row in mock_upsert_issues.call_args.args[1]] == [2]
+    mock_get_comments.assert_not_called()